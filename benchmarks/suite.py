@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+
+"""Benchmark suite for PyPNM reading and writing, with memory profiling.
+
+Generates synthetic noise images of P1 - P7 formats, 8 and 16 bit,
+with and without alpha, at given sizes, and for each of them measures
+``pnm2list``, ``list2bin``, ``list2pnmbin``, ``list2pnmascii``, ``list2pam``
+and ``create_image``:
+
+- time, best of several runs;
+- peak memory allocated by function, measured with ``tracemalloc``
+  in separate run, since tracing slows everything down;
+- peak RSS of the process (not available on Windows).
+
+Each case runs in fresh process, so that RSS of one case does not
+include leftovers of previous ones. Functions and arguments missing in
+revision measured, like ``list2pam`` or ``flat`` in older ones, are detected
+before calling and recorded as unsupported, and case failing otherwise
+is recorded with its error, so that the rest of the suite still runs
+and any two revisions can be compared. Input files are written directly,
+without PyPNM, from fixed random seed, so inputs are the same for all
+revisions measured.
+
+Results are written to JSON file; two such files, made with different
+revisions, are compared with ``compare`` command, which lists all changes
+and exits with code 1 if time or memory grew more than threshold.
+
+Usage::
+
+    python benchmarks/suite.py run [--sizes 1,4,16] [--repeat 3] [--formats P5,P6] [--cases pnm2list] [-o results.json]
+    python benchmarks/suite.py compare old.json new.json [--threshold 10]
+
+Sizes are in megapixels. Nested lists take several dozen bytes per sample,
+so mind available memory when going to 100 megapixels.
+
+"""
+
+import argparse
+import gc
+import inspect
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from random import Random
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pypnm
+from pypnm import pnmlpnm
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# ↓ Image kinds: magic, channels, maxcolors
+FORMATS = (
+    ('P1', 1, 1),
+    ('P2', 1, 255),
+    ('P2', 1, 65535),
+    ('P3', 3, 255),
+    ('P3', 3, 65535),
+    ('P4', 1, 1),
+    ('P5', 1, 255),
+    ('P5', 1, 65535),
+    ('P6', 3, 255),
+    ('P6', 3, 65535),
+    ('P7', 2, 255),
+    ('P7', 2, 65535),
+    ('P7', 4, 255),
+    ('P7', 4, 65535),
+)
+
+SEED = 20240101
+
+# ↓ Changes smaller than that, seconds or bytes, are considered noise by "compare"
+TIME_FLOOR = 0.002
+MEMORY_FLOOR = 65536
+
+""" ╔══════════════════════════════╗
+    ║        Test images           ║
+    ╚══════════════════════════════╝ """
+
+
+def _dimensions(megapixels: float) -> tuple[int, int]:
+    """4:3 image of about given megapixels."""
+
+    X = max(1, round((megapixels * 1e6 * 4 / 3) ** 0.5))
+    return (X, max(1, round(megapixels * 1e6 / X)))
+
+
+def make_image(path: Path, magic: str, X: int, Y: int, Z: int, maxcolors: int) -> None:
+    """Write noise image directly, without PyPNM."""
+
+    random = Random(f'{SEED} {magic} {X} {Y} {Z} {maxcolors}')
+    samples = X * Y * Z
+
+    with open(path, 'wb') as file:
+        if magic == 'P7':
+            tupltype = {2: 'GRAYSCALE_ALPHA', 4: 'RGB_ALPHA'}[Z]
+            file.write(f'P7\nWIDTH {X}\nHEIGHT {Y}\nDEPTH {Z}\nMAXVAL {maxcolors}\nTUPLTYPE {tupltype}\nENDHDR\n'.encode('ascii'))
+        elif magic in ('P1', 'P4'):
+            file.write(f'{magic}\n{X} {Y}\n'.encode('ascii'))
+        else:
+            file.write(f'{magic}\n{X} {Y}\n{maxcolors}\n'.encode('ascii'))
+
+        if magic == 'P4':
+            file.write(random.randbytes((X + 7) // 8 * Y))
+        elif magic in ('P5', 'P6', 'P7'):
+            file.write(random.randbytes(samples * (1 if maxcolors < 256 else 2)))
+        else:
+            # ↓ ASCII written row by row, lines under 70 characters
+            per_line = 35 if magic == 'P1' else 70 // (len(str(maxcolors)) + 1)
+            for _ in range(Y):
+                row = [random.randint(0, maxcolors) for _ in range(X * Z)]
+                lines = (' '.join(map(str, row[i : i + per_line])) for i in range(0, len(row), per_line))
+                file.write(('\n'.join(lines) + '\n').encode('ascii'))
+
+
+""" ╔══════════════════════════════╗
+    ║     Cases and measuring      ║
+    ╚══════════════════════════════╝ """
+
+
+# ↓ Setups return (positional arguments, keyword arguments) for measured function.
+#   Paths are passed as str, which all revisions accept.
+
+
+def _read_nested(path: Path, out_path: Path, image: tuple) -> tuple:
+    return ((str(path),), {})
+
+
+def _read_flat(path: Path, out_path: Path, image: tuple) -> tuple:
+    return ((str(path),), {'flat': True})
+
+
+def _loaded(path: Path, out_path: Path, image: tuple) -> tuple:
+    _, _, _, maxcolors, list_3d = pnmlpnm.pnm2list(str(path))
+    return ((list_3d, maxcolors), {})
+
+
+def _loaded_write(path: Path, out_path: Path, image: tuple) -> tuple:
+    args, kwargs = _loaded(path, out_path, image)
+    return ((str(out_path),) + args, kwargs)
+
+
+def _sizes(path: Path, out_path: Path, image: tuple) -> tuple:
+    X, Y, Z, maxcolors = image
+    # ↓ Older create_image knows nothing of maxcolors, producing the same zero image
+    return ((X, Y, Z), {'maxcolors': maxcolors} if 'maxcolors' in inspect.signature(pnmlpnm.create_image).parameters else {})
+
+
+# ↓ Case name: (formats it applies to, setup returning arguments, function name in pnmlpnm)
+CASES = {
+    'pnm2list': (('P1', 'P2', 'P3', 'P4', 'P5', 'P6', 'P7'), _read_nested, 'pnm2list'),
+    'pnm2list flat': (('P1', 'P2', 'P3', 'P4', 'P5', 'P6', 'P7'), _read_flat, 'pnm2list'),
+    'list2bin': (('P1', 'P2', 'P3', 'P4', 'P5', 'P6', 'P7'), _loaded, 'list2bin'),
+    'list2pnmbin': (('P4', 'P5', 'P6'), _loaded_write, 'list2pnmbin'),
+    'list2pnmascii': (('P1', 'P2', 'P3'), _loaded_write, 'list2pnmascii'),
+    'list2pam': (('P7',), _loaded_write, 'list2pam'),
+    'create_image': (('P5', 'P6', 'P7'), _sizes, 'create_image'),
+}
+
+
+def _rss() -> int | None:
+    """Peak resident set size of current process, bytes."""
+
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024  # Linux reports kilobytes
+
+
+def measure(case: str, path: str, repeat: int, image: tuple) -> dict:
+    """Run one case in current process, return time and memory measured.
+
+    :param str case: ``CASES`` name;
+    :param str path: input image file name;
+    :param int repeat: number of timed runs;
+    :param tuple image: (X, Y, Z, maxcolors) of input image;
+    :return: measured values, or ``error`` message, with ``unsupported``
+        set if function or argument is missing in revision measured.
+
+    """
+
+    _, setup, name = CASES[case]
+    if not hasattr(pnmlpnm, name):
+        return {'error': f'no {name} function', 'unsupported': True}
+    function = getattr(pnmlpnm, name)
+    out_path = Path(path).with_name(f'out_{Path(path).name}')
+
+    try:
+        args, kwargs = setup(Path(path), out_path, image)
+        try:
+            inspect.signature(function).bind(*args, **kwargs)
+        except TypeError as error:
+            return {'error': f'{name}: {error}', 'unsupported': True}
+        rss_setup = _rss()
+
+        times = []
+        for _ in range(repeat):
+            gc.collect()
+            start = perf_counter()
+            function(*args, **kwargs)
+            times.append(perf_counter() - start)
+        rss_peak = _rss()
+
+        gc.collect()
+        tracemalloc.start()
+        try:
+            function(*args, **kwargs)
+            _, traced_peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    except Exception as error:  # Like format not supported by revision measured; recorded, suite goes on
+        return {'error': f'{type(error).__name__}: {error}'}
+    finally:
+        out_path.unlink(missing_ok=True)
+
+    return {
+        'seconds': min(times),
+        'seconds_all': times,
+        'traced_peak': traced_peak,
+        'rss_setup': rss_setup,
+        'rss_peak': rss_peak,
+    }
+
+
+def _revision() -> str | None:
+    """Current git revision of PyPNM tree, if any."""
+
+    try:
+        return subprocess.run(['git', 'describe', '--always', '--dirty'], cwd=Path(__file__).resolve().parent, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes: list[float], repeat: int = 3, formats: list[str] | None = None, cases: list[str] | None = None, data_dir: str | None = None, report=print) -> dict:
+    """Generate images and measure all cases, each in fresh process.
+
+    :param list sizes: image sizes, megapixels;
+    :param int repeat: number of timed runs, best one is recorded;
+    :param formats: magic numbers to measure, default ``None`` means all;
+    :param cases: ``CASES`` names to measure, default ``None`` means all;
+    :param data_dir: directory for generated images, default ``None`` means temporary one;
+    :param report: function, called with progress line for each case;
+    :return: results, ready to be dumped to JSON.
+
+    """
+
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        directory = Path(data_dir or temp_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        # ↓ Fresh process for every case, so peak RSS is measured for that case only
+        with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as pool:
+            for megapixels in sizes:
+                X, Y = _dimensions(megapixels)
+                for magic, Z, maxcolors in FORMATS:
+                    if formats and magic not in formats:
+                        continue
+                    path = directory / f'{magic}_{X}x{Y}x{Z}x{maxcolors}.pnm'
+                    if not path.exists():
+                        make_image(path, magic, X, Y, Z, maxcolors)
+                    for case, (case_formats, _, _) in CASES.items():
+                        if magic not in case_formats or (cases and case not in cases):
+                            continue
+                        result = {'case': case, 'magic': magic, 'X': X, 'Y': Y, 'Z': Z, 'maxcolors': maxcolors}
+                        try:
+                            result.update(pool.submit(measure, case, str(path), repeat, (X, Y, Z, maxcolors)).result())
+                        except Exception as error:  # Worker killed, like out of memory
+                            result.update({'error': f'{type(error).__name__}: {error}'})
+                        results.append(result)
+                        if 'error' in result:
+                            report(f'{case:<14} {magic} {X}x{Y}x{Z} {maxcolors:>5}: {"unsupported" if result.get("unsupported") else "failed"}, {result["error"]}')
+                        else:
+                            report(f'{case:<14} {magic} {X}x{Y}x{Z} {maxcolors:>5}: {result["seconds"]:8.3f} s, traced {result["traced_peak"] / 1048576:8.1f} MB' + (f', RSS {result["rss_peak"] / 1048576:8.1f} MB' if result['rss_peak'] is not None else ''))
+
+    try:
+        import numpy
+
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+
+    return {
+        'meta': {
+            'pypnm': pypnm.__version__,
+            'revision': _revision(),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'numpy': numpy_version,
+            'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+""" ╔══════════════════════════════╗
+    ║         Comparison           ║
+    ╚══════════════════════════════╝ """
+
+
+def _key(result: dict) -> tuple:
+    return (result['case'], result['magic'], result['X'], result['Y'], result['Z'], result['maxcolors'])
+
+
+def _status(result: dict) -> str:
+    if 'error' not in result:
+        return 'ok'
+    return 'unsupported' if result.get('unsupported') else 'failed'
+
+
+def compare(old: dict, new: dict, threshold: float = 10.0, report=print) -> list[tuple]:
+    """Compare two ``run`` results, return list of regressions.
+
+    Time, traced memory and RSS of each case present in both are compared;
+    growth above ``threshold`` percent, and above noise floor, is a regression.
+    Case failing in new results only is a regression too, with ``error``
+    as measure; case failing or unsupported in old results is just listed.
+
+    :return: list of (case key, measure, old value, new value) tuples.
+
+    """
+
+    old_results = {_key(result): result for result in old['results']}
+    regressions = []
+    report(f'old: {old["meta"].get("revision")} {old["meta"].get("date")}, new: {new["meta"].get("revision")} {new["meta"].get("date")}')
+    report(f'{"case":<14} {"image":<26}{"time":>20}{"traced":>20}{"RSS":>20}')
+
+    for result in new['results']:
+        key = _key(result)
+        if key not in old_results:
+            continue
+        old_result = old_results[key]
+        case, magic, X, Y, Z, maxcolors = key
+        if 'error' in result or 'error' in old_result:
+            if 'error' in result and 'error' not in old_result:
+                regressions.append((key, 'error', None, result['error']))
+            old_status, new_status = _status(old_result), _status(result)
+            report(f'{case:<14} {f"{magic} {X}x{Y}x{Z} {maxcolors}":<26}{old_status:>20} -> {new_status}' + (' !' if new_status != 'ok' and old_status == 'ok' else ''))
+            continue
+        columns = ''
+        flags = ''
+        for measure, floor, unit in (('seconds', TIME_FLOOR, 1), ('traced_peak', MEMORY_FLOOR, 1048576), ('rss_peak', MEMORY_FLOOR, 1048576)):
+            old_value, new_value = old_result.get(measure), result.get(measure)
+            if old_value is None or new_value is None:
+                columns += f'{"-":>20}'
+                continue
+            change = (new_value - old_value) / old_value * 100 if old_value else 0.0
+            columns += f'{f"{new_value / unit:.3f} ({change:+.0f}%)":>20}'
+            if change > threshold and new_value - old_value > floor:
+                regressions.append((key, measure, old_value, new_value))
+                flags += ' !'
+        report(f'{case:<14} {f"{magic} {X}x{Y}x{Z} {maxcolors}":<26}{columns}{flags}')
+
+    missing = old_results.keys() - {_key(result) for result in new['results']}
+    if missing:
+        report(f'{len(missing)} cases of old results are missing in new ones')
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command line entry point, return exit code."""
+
+    parser = argparse.ArgumentParser(description='PyPNM benchmark suite.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='measure and write JSON results')
+    run_parser.add_argument('--sizes', default='1', help='comma-separated image sizes in megapixels, default 1')
+    run_parser.add_argument('--repeat', type=int, default=3, help='timed runs per case, best one recorded, default 3')
+    run_parser.add_argument('--formats', default=None, help='comma-separated magic numbers, like P5,P6; default all')
+    run_parser.add_argument('--cases', default=None, help=f'comma-separated cases of: {", ".join(CASES)}; default all')
+    run_parser.add_argument('--data', default=None, help='directory to keep generated images in, default temporary')
+    run_parser.add_argument('-o', '--output', default=None, help='JSON file name, default bench_REVISION.json')
+
+    compare_parser = commands.add_parser('compare', help='compare two JSON results')
+    compare_parser.add_argument('old')
+    compare_parser.add_argument('new')
+    compare_parser.add_argument('--threshold', type=float, default=10.0, help='allowed growth, percent, default 10')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        results = run(
+            [float(size) for size in args.sizes.split(',')],
+            repeat=args.repeat,
+            formats=args.formats.split(',') if args.formats else None,
+            cases=args.cases.split(',') if args.cases else None,
+            data_dir=args.data,
+        )
+        output = args.output or f'bench_{results["meta"]["revision"] or "unknown"}.json'
+        Path(output).write_text(json.dumps(results, indent=1), encoding='utf-8')
+        print(f'{len(results["results"])} cases written to {output}')
+        return 0
+
+    regressions = compare(json.loads(Path(args.old).read_text(encoding='utf-8')), json.loads(Path(args.new).read_text(encoding='utf-8')), args.threshold)
+    if regressions:
+        print(f'{len(regressions)} regressions above {args.threshold}%:', file=sys.stderr)
+        for (case, magic, X, Y, Z, maxcolors), measure, old_value, new_value in regressions:
+            if measure == 'error':
+                print(f'  {case} {magic} {X}x{Y}x{Z} {maxcolors}: {new_value}', file=sys.stderr)
+            else:
+                print(f'  {case} {magic} {X}x{Y}x{Z} {maxcolors}: {measure} {old_value:.6g} -> {new_value:.6g}', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
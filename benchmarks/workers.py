@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+"""Benchmark for ``workers`` option of PyPNM ``pnm2list`` and ``list2pnm``.
+
+Creates synthetic noise image, writes it as ASCII PPM to temporary directory,
+then times reading and writing with 1, 2, 4... worker processes, up to number
+of CPU cores, but at least 2, and prints speedup compared to single-process path.
+Binary images ignore ``workers``, so only ASCII ones are measured.
+
+Usage::
+
+    python benchmarks/workers.py [X] [Y] [maxcolors]
+
+"""
+
+import array
+import os
+import random
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pypnm
+
+
+def _timed(function, *args, **kwargs) -> float:
+    """Run function once, return time spent in seconds."""
+
+    start = perf_counter()
+    function(*args, **kwargs)
+    return perf_counter() - start
+
+
+def main(X: int = 3000, Y: int = 2000, maxcolors: int = 255) -> None:
+    """Print speedup curve table for reading and writing."""
+
+    datatype = 'B' if maxcolors < 256 else 'H'
+    image = pypnm.PNMImage(X, Y, 3, maxcolors, array.array(datatype, random.randbytes(X * Y * 3 * (1 if datatype == 'B' else 2))))
+    list_3d = pypnm.image2list(image)
+
+    counts = [1]
+    while counts[-1] * 2 <= max(os.cpu_count() or 1, 2):  # Showing overhead on single core, too
+        counts.append(counts[-1] * 2)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        ascii_name = Path(temp_dir) / 'bench_ascii.ppm'
+        out_name = Path(temp_dir) / 'bench_out.ppm'
+        pypnm.list2pnm(ascii_name, image, maxcolors, bin=False)
+
+        cases = {
+            'read ASCII, nested': lambda workers: _timed(pypnm.pnm2list, ascii_name, workers=workers),
+            'read ASCII, flat': lambda workers: _timed(pypnm.pnm2list, ascii_name, flat=True, workers=workers),
+            'write ASCII, nested': lambda workers: _timed(pypnm.list2pnm, out_name, list_3d, maxcolors, bin=False, workers=workers),
+            'write ASCII, flat': lambda workers: _timed(pypnm.list2pnm, out_name, image, maxcolors, bin=False, workers=workers),
+        }
+
+        print(f'{X} x {Y} RGB, maxcolors {maxcolors}, {os.cpu_count()} CPU cores')
+        print(f'{"case":<22}' + ''.join(f'{f"{workers} workers":>14}' for workers in counts))
+        for name, case in cases.items():
+            single = case(None)
+            times = [single] + [case(workers) for workers in counts[1:]]
+            print(f'{name:<22}' + ''.join(f'{f"{time:.2f}s x{single / time:.1f}":>14}' for time in times))
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:4]))
@@ -44,13 +44,47 @@ to access functions:
 - **``list2pnm``**: getting image data as nested list of int and writing
   either binary or ASCII PNM file depending on ``bin`` bool argument.
 
+- ``PNMImage``: compact flat image container, accepted by the functions
+  above instead of nested list, and returned by ``pnm2list(..., flat=True)``;
+  ``list2image`` and ``image2list`` convert between the two representations.
+
+- ``pnm_info``: image properties from header only, as ``PNMInfo`` named tuple.
+
+- ``pnm_open``, ``pnm2buffer``: zero-copy access to binary PPM or PGM
+  image data as read-only ``memoryview`` over memory-mapped file.
+
+- ``pnm_iter_rows``: generator reading any PNM file row by row.
+
+- ``pnm_read_region``: reading rectangular region (crop) of PNM file.
+
+- ``pnm_thumbnail``: reading PNM file downscaled by integer step, for previews.
+
+- ``list2pam``: writing PAM file, keeping alpha channel;
+  also available as ``list2pnm(..., pam=True)``.
+
+- ``list2pbm``: writing 1 bit binary or ASCII PBM file, thresholding
+  image data with optional error diffusion dithering.
+
+- ``PNMWriter``: context manager writing binary or ASCII PNM file row by row.
+
+- ``pnm_frames``, ``frames2pnm``: reading and writing multi-image PNM
+  files or pipes image by image.
+
+- ``pnm2ndarray``, ``ndarray2pnm``: reading and writing PNM file
+  as NumPy ``ndarray``, if optional NumPy is installed.
+
+- ``add_stage_hook``, ``remove_stage_hook``, ``stage_hooks``: optional
+  per-stage timing of reading and writing, logged with ``StageLog``
+  as JSON lines, or summed up with ``StageProfile`` for ``pstats``.
+
 
 Formats compatibility
 ---------------------
 
 Module provides full read and write support for 8 and 16 bpc binary and ASCII
-`PPM`_ and `PGM`_ image files, and read-only support for
-1 bpc binary and ASCII `PBM`_ files.
+`PPM`_ and `PGM`_ image files, and 1 bpc binary and ASCII `PBM`_ files,
+the latter being promoted to 8 bpc L upon reading, as well as
+L, LA, RGB and RGBA `PAM`_ files with alpha channel preserved.
 
 Python compatibility
 --------------------
@@ -91,6 +125,8 @@ In case of introducing useful modifications it's your duty to all human race
 
 .. _PBM: https://netpbm.sourceforge.net/doc/pbm.html
 
+.. _PAM: https://netpbm.sourceforge.net/doc/pam.html
+
 """
 
 __author__ = 'Ilya Razmanov'
@@ -102,9 +138,32 @@ __maintainer__ = 'Ilya Razmanov'
 __email__ = 'ilyarazmanov@gmail.com'
 __status__ = 'Production'
 
-from .pnmlpnm import list2bin, list2pnm, pnm2list
+from .pnmlpnm import PNMImage, PNMInfo, PNMWriter, StageLog, StageProfile, add_stage_hook, create_image, frames2pnm, image2list, list2bin, list2image, list2pam, list2pbm, list2pnm, ndarray2pnm, pnm2buffer, pnm2list, pnm2ndarray, pnm_frames, pnm_info, pnm_iter_rows, pnm_open, pnm_read_region, pnm_thumbnail, remove_stage_hook, stage_hooks
 
 # ↓ Assignments below do nothing but stop linter from bitching and whining.
 pnm2list = pnm2list
 list2bin = list2bin
 list2pnm = list2pnm
+PNMImage = PNMImage
+list2image = list2image
+image2list = image2list
+create_image = create_image
+pnm_open = pnm_open
+pnm2buffer = pnm2buffer
+pnm_iter_rows = pnm_iter_rows
+PNMWriter = PNMWriter
+list2pbm = list2pbm
+list2pam = list2pam
+pnm_frames = pnm_frames
+frames2pnm = frames2pnm
+pnm2ndarray = pnm2ndarray
+ndarray2pnm = ndarray2pnm
+pnm_info = pnm_info
+PNMInfo = PNMInfo
+pnm_read_region = pnm_read_region
+pnm_thumbnail = pnm_thumbnail
+add_stage_hook = add_stage_hook
+remove_stage_hook = remove_stage_hook
+stage_hooks = stage_hooks
+StageLog = StageLog
+StageProfile = StageProfile
@@ -0,0 +1,11 @@
+"""Command line entry point: ``python -m pypnm convert [options] INPUT [INPUT ...] -o OUTPUT_DIR``.
+
+See ``pypnm.batch`` for options.
+
+"""
+
+import sys
+
+from .batch import main
+
+sys.exit(main())
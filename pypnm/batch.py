@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+
+"""
+===========
+PyPNM batch
+===========
+---------------------------------------------------
+Batch conversion of PNM files, run from command line.
+---------------------------------------------------
+
+Usage
+-----
+
+::
+
+    python -m pypnm convert [options] INPUT [INPUT ...] -o OUTPUT_DIR
+
+or, with PyPNM installed::
+
+    pypnm-batch [options] INPUT [INPUT ...] -o OUTPUT_DIR
+
+where ``INPUT`` is file name, glob pattern (like ``"scans/**/*.ppm"``),
+or directory, all PBM, PGM, PPM, PNM and PAM files of which are converted.
+
+Options:
+
+- ``--ascii`` or ``--binary``: output encoding, default is the same as input;
+- ``--8bit``: reduce 16 bit images to 8 bit;
+- ``--drop-alpha``: skip alpha channel, default for all formats but PAM;
+- ``--pam``: write PAM, keeping alpha;
+- ``--pbm``: write 1 bit PBM, thresholded, optionally ``--dither``;
+  PBM input is written as PBM unless ``--pam`` is given;
+- ``-j``, ``--jobs``: number of files converted concurrently,
+  default is number of CPU cores.
+
+Files are converted concurrently by process pool, using ``pnm2list``
+for reading and ``list2pnm``, ``list2pam`` or ``list2pbm`` for writing.
+Output files are placed relative to ``INPUT`` they come from:
+files given by name go directly to ``OUTPUT_DIR``, as do files of directory given,
+while files found by glob pattern keep their subdirectories below pattern base,
+like ``scans/a/1.ppm`` becoming ``OUTPUT_DIR/a/1.ppm`` for ``"scans/**/*.ppm"``.
+Files which would be written to the same output file, like ``x.ppm``
+of two directories given, are reported as errors, all but the first one.
+Time and throughput are reported for every file; files failing
+to convert, like ones with malformed header, are reported and skipped,
+and all errors are listed at the end, exit code being 1 if there were any.
+
+"""
+
+__author__ = 'Ilya Razmanov'
+__copyright__ = '(c) 2024-2026 Ilya Razmanov'
+__credits__ = 'Ilya Razmanov'
+__license__ = 'unlicense'
+__version__ = '2.26.27.312'
+__maintainer__ = 'Ilya Razmanov'
+__email__ = 'ilyarazmanov@gmail.com'
+__status__ = 'Production'
+
+import argparse
+import array
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from glob import glob
+from pathlib import Path
+from time import perf_counter
+
+from .pnmlpnm import PNMImage, list2pam, list2pbm, list2pnm, pnm2list, pnm_info
+
+# ↓ File extensions considered PNM when directory is given
+PNM_SUFFIXES = ('.pbm', '.pgm', '.ppm', '.pnm', '.pam')
+
+""" ╔══════════════════════════════╗
+    ║   Single file conversion     ║
+    ╚══════════════════════════════╝ """
+
+
+def _to_8bit(image: PNMImage) -> PNMImage:
+    """Reduce image with ``maxcolors`` above 255 to 8 bit, rounding with lookup table."""
+
+    maxcolors = image.maxcolors
+    table = bytes((value * 255 + maxcolors // 2) // maxcolors for value in range(maxcolors + 1))
+    return PNMImage(image.X, image.Y, image.Z, 255, array.array('B', bytes(map(table.__getitem__, image.data))))
+
+
+def target_name(source: str, target_dir: str, magic: str, Z: int, pam: bool = False, pbm: bool = False) -> str:
+    """Output file name for ``source`` of given ``magic`` and ``Z``, converted with ``pam`` and ``pbm`` options."""
+
+    # ↓ 1 bit source stays 1 bit unless PAM is requested
+    if pbm or (magic in ('P1', 'P4') and not pam):
+        suffix = '.pbm'
+    elif pam:
+        suffix = '.pam'
+    else:
+        suffix = '.pgm' if Z < 3 else '.ppm'
+    return str(Path(target_dir) / (Path(source).stem + suffix))
+# ↑ End of 'target_name' function
+
+
+def convert_file(source: str, target_dir: str, bin: bool | None = None, to_8bit: bool = False, drop_alpha: bool = False, pam: bool = False, pbm: bool = False, dither: bool = False) -> tuple[str, str, float, int, int]:
+    """Convert one PNM file, writing result to ``target_dir`` under the same stem.
+
+    :param str source: input file name;
+    :param str target_dir: output directory, created if necessary;
+    :param bin: whether output is binary or ASCII, ``None`` means the same as input;
+    :type bin: bool | None
+    :param bool to_8bit: reduce 16 bit image to 8 bit;
+    :param bool drop_alpha: skip alpha channel even for PAM;
+    :param bool pam: write PAM, keeping alpha unless ``drop_alpha``;
+    :param bool pbm: write 1 bit PBM; PBM source is written as PBM anyway unless ``pam``;
+    :param bool dither: dither PBM output;
+    :return source, target, seconds, size, pixels: tuple, consisting of
+        input and output file names, time spent, input file size in bytes,
+        and number of pixels converted.
+
+    """
+
+    start = perf_counter()
+
+    with open(source, 'rb') as file:
+        magic = file.read(2)
+    if bin is None:
+        bin = magic not in (b'P1', b'P2', b'P3')
+
+    X, Y, Z, maxcolors, image = pnm2list(source, flat=True)
+
+    if to_8bit and maxcolors > 255:
+        image = _to_8bit(image)
+        maxcolors = 255
+
+    if drop_alpha and Z in (2, 4):
+        # ↓ Skipping alpha by extended slicing channel by channel
+        data = array.array(image.data.typecode, bytes(X * Y * (Z - 1) * image.data.itemsize))
+        for z in range(Z - 1):
+            data[z :: Z - 1] = image.data[z::Z]
+        Z -= 1
+        image = PNMImage(X, Y, Z, maxcolors, data)
+
+    target = target_name(source, target_dir, magic.decode('ascii'), Z, pam, pbm)
+    Path(target_dir).mkdir(parents=True, exist_ok=True)
+
+    if target.endswith('.pbm'):
+        list2pbm(target, image, maxcolors, bin=bin, dither=dither)
+    elif pam:
+        list2pam(target, image, maxcolors)
+    else:
+        list2pnm(target, image, maxcolors, bin=bin)
+
+    return (source, target, perf_counter() - start, os.path.getsize(source), X * Y)
+# ↑ End of 'convert_file' function
+
+
+""" ╔══════════════════════════════╗
+    ║    Batch and command line    ║
+    ╚══════════════════════════════╝ """
+
+
+def _glob_base(pattern: str) -> Path:
+    """Leading part of glob ``pattern`` without wildcards, to which found files are relative."""
+
+    base = Path()
+    for part in Path(pattern).parts[:-1]:
+        if any(char in part for char in '*?['):
+            break
+        base /= part
+    return base
+# ↑ End of '_glob_base' function
+
+
+def collect_sources(inputs: list[str]) -> list[tuple[str, str]]:
+    """Expand file names, glob patterns and directories to sorted list of PNM files without duplicates.
+
+    :param list inputs: file names, glob patterns and directories;
+    :return: list of (source, subdirectory) tuples, subdirectory being
+        relative to input item source came from, so that output directory
+        does not depend on where input lies: empty for file and directory items,
+        path below pattern base for files found by glob pattern.
+
+    """
+
+    sources = {}
+    for item in inputs:
+        if Path(item).is_dir():
+            found = [(str(path), '') for path in sorted(Path(item).iterdir()) if path.suffix.lower() in PNM_SUFFIXES and path.is_file()]
+        elif Path(item).is_file():
+            found = [(item, '')]
+        else:
+            base = _glob_base(item)
+            found = [(name, str(Path(name).parent.relative_to(base))) for name in sorted(glob(item, recursive=True)) if Path(name).is_file()]
+        for source, subdir in found:
+            sources.setdefault(source, subdir)
+
+    return list(sources.items())
+# ↑ End of 'collect_sources' function
+
+
+def convert_batch(sources: list[str | tuple[str, str]], target_dir: str, jobs: int | None = None, report=print, **options) -> tuple[list[tuple[str, str, float, int, int]], list[tuple[str, str]]]:
+    """Convert ``sources`` concurrently with process pool, collecting errors instead of stopping.
+
+    :param list sources: input file names, written directly to ``target_dir``,
+        or (source, subdirectory) tuples, as returned by ``collect_sources``,
+        written to subdirectory of ``target_dir``;
+    :param str target_dir: output directory;
+    :param jobs: number of processes, default ``None`` means number of CPU cores;
+    :type jobs: int | None
+    :param report: function, called with progress line for each file;
+    :param options: ``convert_file`` keyword arguments;
+    :return done, errors: lists of ``convert_file`` results,
+        and of (source, error message) tuples, both in ``sources`` order.
+
+    Sources which would be written to the same output file, like ``a/x.ppm``
+    and ``b/x.ppm`` given as directories ``a`` and ``b``, or ``x.pnm`` and ``x.ppm``
+    of the same directory, are detected before converting: the first one
+    is converted, the rest are reported as errors, so no output is overwritten.
+
+    """
+
+    sources = dict((source, '') if isinstance(source, str) else source for source in sources)
+
+    done = {}
+    errors = {}
+
+    # ↓ Predicting output names from headers, so that concurrent conversions never write the same file
+    targets = {}
+    for source, subdir in sources.items():
+        try:
+            info = pnm_info(source)
+        except Exception:  # Malformed file, reported by convert_file
+            continue
+        target = Path(target_name(source, str(Path(target_dir) / subdir), info.magic, info.Z, options.get('pam', False), options.get('pbm', False))).resolve()
+        if target in targets:
+            errors[source] = f'FileExistsError: output {target} is already written from {targets[target]}'
+            report(f'FAILED {source}: {errors[source]}')
+        else:
+            targets[target] = source
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(convert_file, source, str(Path(target_dir) / subdir), **options): source for source, subdir in sources.items() if source not in errors}
+        for future in as_completed(futures):
+            source = futures[future]
+            try:
+                result = future.result()
+            except Exception as error:  # Malformed files must not stop the batch
+                errors[source] = f'{type(error).__name__}: {error}'
+                report(f'FAILED {source}: {errors[source]}')
+            else:
+                done[source] = result
+                _, target, seconds, size, pixels = result
+                report(f'{source} -> {target}: {seconds:.3f} s, {size / 1048576 / max(seconds, 1e-9):.1f} MB/s, {pixels / 1e6 / max(seconds, 1e-9):.1f} Mpx/s')
+
+    return ([done[source] for source in sources if source in done], [(source, errors[source]) for source in sources if source in errors])
+# ↑ End of 'convert_batch' function
+
+
+def _parser(prog: str | None = None) -> argparse.ArgumentParser:
+    """Command line arguments for ``convert``."""
+
+    parser = argparse.ArgumentParser(prog=prog, description='Convert PBM, PGM, PPM and PAM files.')
+    parser.add_argument('inputs', nargs='+', metavar='INPUT', help='file, glob pattern or directory')
+    parser.add_argument('-o', '--output', required=True, metavar='OUTPUT_DIR', help='directory for converted files')
+    encoding = parser.add_mutually_exclusive_group()
+    encoding.add_argument('--ascii', dest='bin', action='store_const', const=False, default=None, help='write ASCII P1, P2 or P3')
+    encoding.add_argument('--binary', dest='bin', action='store_const', const=True, help='write binary P4, P5 or P6')
+    kind = parser.add_mutually_exclusive_group()
+    kind.add_argument('--pam', action='store_true', help='write PAM, keeping alpha')
+    kind.add_argument('--pbm', action='store_true', help='write 1 bit PBM')
+    parser.add_argument('--8bit', dest='to_8bit', action='store_true', help='reduce 16 bit images to 8 bit')
+    parser.add_argument('--drop-alpha', action='store_true', help='skip alpha channel, even for PAM')
+    parser.add_argument('--dither', action='store_true', help='dither PBM output')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='number of files converted concurrently, default is number of CPU cores')
+    return parser
+
+
+def convert_main(argv: list[str] | None = None, prog: str | None = 'pypnm-batch') -> int:
+    """Run batch conversion from command line arguments, return exit code."""
+
+    args = _parser(prog).parse_args(argv)
+
+    sources = collect_sources(args.inputs)
+    if not sources:
+        print('No PNM files found', file=sys.stderr)
+        return 1
+
+    start = perf_counter()
+    done, errors = convert_batch(sources, args.output, jobs=args.jobs, bin=args.bin, to_8bit=args.to_8bit, drop_alpha=args.drop_alpha, pam=args.pam, pbm=args.pbm, dither=args.dither)
+    seconds = perf_counter() - start
+
+    size = sum(result[3] for result in done)
+    pixels = sum(result[4] for result in done)
+    print(f'{len(done)} of {len(sources)} files converted in {seconds:.2f} s: {len(done) / seconds:.1f} files/s, {size / 1048576 / seconds:.1f} MB/s, {pixels / 1e6 / seconds:.1f} Mpx/s')
+    if errors:
+        print(f'{len(errors)} errors:', file=sys.stderr)
+        for source, message in errors:
+            print(f'  {source}: {message}', file=sys.stderr)
+        return 1
+    return 0
+# ↑ End of 'convert_main' function
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for ``python -m pypnm COMMAND ...``."""
+
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] != 'convert':
+        print('Usage: python -m pypnm convert [options] INPUT [INPUT ...] -o OUTPUT_DIR', file=sys.stderr)
+        return 2
+    return convert_main(argv[1:], prog='python -m pypnm convert')
+# ↑ End of 'main' function
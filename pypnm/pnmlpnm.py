@@ -16,7 +16,8 @@ PyPNM module comprise a set of functions for dealing with
 Python nested lists, namely:
 
 - **``pnm2list``**: reading binary or ASCII
-  RGB `PPM`_, or L `PGM`_, or ink on/off `PBM`_ file
+  RGB `PPM`_, or L `PGM`_, or ink on/off `PBM`_ file,
+  or L, LA, RGB, RGBA `PAM`_ file,
   and returning image data as nested list of int.
 
 - **``list2bin``**: getting image data as nested list of int and
@@ -37,7 +38,38 @@ Python nested lists, namely:
 - **``list2pnm``**: getting image data as nested list of int
   and writing either binary or ASCII PNM file depending on ``bin`` value.
 
-- ``create_image``: creating empty nested 3D list for image representation.
+- ``create_image``: creating empty nested 3D list, or flat ``PNMImage``,
+  for image representation.
+
+- ``PNMImage``: compact image container, keeping image data
+  as one flat ``array`` of int instead of nested lists.
+
+- ``list2image``, ``image2list``: converting nested list
+  to ``PNMImage`` and vice versa.
+
+- ``pnm_info``: reading image properties from header only, without touching image data.
+
+- ``pnm_open``, ``pnm2buffer``: memory-mapping binary PPM (P6), PGM (P5) or PAM (P7) file
+  and returning read-only ``memoryview`` of image data without reading it.
+
+- ``pnm_iter_rows``: reading any PNM file row by row with generator,
+  keeping memory usage independent of image height.
+
+- ``pnm_read_region``: reading rectangular region of PNM file,
+  only region rows being read for binary formats.
+
+- ``pnm_thumbnail``: reading PNM file downscaled by integer step,
+  skipping rows and pixels in between, or averaging blocks of them.
+
+- ``pnm_frames``, ``frames2pnm``: reading and writing multi-image
+  PNM files and streams (like video frames piped from ffmpeg) image by image.
+
+- ``pnm2ndarray``, ``ndarray2pnm``: reading and writing PNM file
+  as NumPy ``ndarray``; available only if optional NumPy is installed.
+
+- ``add_stage_hook``, ``remove_stage_hook``, ``stage_hooks``: reporting
+  time of each stage of reading and writing to registered callables,
+  like ``StageLog`` (JSON lines) and ``StageProfile`` (``pstats`` format).
 
 Usage
 -----
@@ -67,9 +99,17 @@ for writing data from ``list_3d`` nested list to PPM/PGM file ``out_filename``,
 where ``bin`` is a bool switch defining whether
 resulting file will be binary or ASCII.
 
+For large images use::
+
+    X, Y, Z, maxcolors, image = pnmlpnm.pnm2list(in_filename, flat=True)
+
+to get ``image`` as flat ``PNMImage``, taking 1 or 2 bytes per sample;
+``list2bin`` and ``list2pnm`` accept ``PNMImage`` in place of ``list_3d``.
+
 .. note:: ``maxcolors`` is either 255 for 8 bit or 65535 for 16 bit images.
     1 bit ink on/off images get promoted and inverted to 8 bit L upon import,
-    i.e. PBM converted to PGM when reading (writing PBM is not planned).
+    i.e. PBM converted to PGM when reading; ``list2pbm`` writes them back
+    by thresholding, optionally with error diffusion dithering.
 
 References
 ----------
@@ -89,6 +129,8 @@ References
 
 .. _PBM: https://netpbm.sourceforge.net/doc/pbm.html
 
+.. _PAM: https://netpbm.sourceforge.net/doc/pam.html
+
 .. _PyPNM for Python >= 3.11: https://github.com/Dnyarri/PyPNM/
 
 .. _PyPNM for Python >= 3.4: https://github.com/Dnyarri/PyPNM/tree/py34
@@ -111,329 +153,1681 @@ __email__ = 'ilyarazmanov@gmail.com'
 __status__ = 'Production'
 
 import array
+import gc
+import json
+import marshal
 import mmap
-from re import search, sub
+import re
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from io import BytesIO
+from itertools import chain, islice, repeat
+from os import PathLike, fstat
+from time import perf_counter, time
+from typing import NamedTuple
 
 """ ╔══════════════════════════════╗
-    ║           pnm2list           ║
+    ║      Stage timing hooks      ║
+    ╚══════════════════════════════╝ """
+
+# ↓ Registered hooks; while list is empty, stages are neither timed nor reported
+_STAGE_HOOKS = []
+
+
+def add_stage_hook(hook) -> None:
+    """Register ``hook`` to be called after each stage of reading and writing.
+
+    Hook is called as ``hook(function, stage, seconds, nbytes, samples)``,
+    where ``function`` and ``stage`` are names (str), like ``'pnm2list', 'header'``,
+    ``seconds`` is stage duration (float), ``nbytes`` and ``samples``
+    are number of bytes and samples processed by stage (int, 0 if not applicable).
+    Stages are reported by ``pnm2list`` (and raster decoding it uses),
+    ``image2list``, ``list2bin``, and ``PNMWriter``, and therefore by all ``list2pnm`` writers.
+
+    :param hook: callable, like ``StageLog`` or ``StageProfile`` object.
+
+    """
+
+    _STAGE_HOOKS.append(hook)
+
+
+def remove_stage_hook(hook) -> None:
+    """Unregister ``hook``, registered with ``add_stage_hook``."""
+
+    _STAGE_HOOKS.remove(hook)
+
+
+@contextmanager
+def stage_hooks(*hooks):
+    """Context manager, registering ``hooks`` for the duration of ``with`` block, ``StageLog`` ones being closed afterwards::
+
+        profile = StageProfile()
+        with stage_hooks(profile, StageLog('stages.jsonl')):
+            X, Y, Z, maxcolors, image = pnm2list(in_filename)
+        pstats.Stats(profile).sort_stats('tottime').print_stats()
+
+    """
+
+    for hook in hooks:
+        add_stage_hook(hook)
+    try:
+        yield hooks
+    finally:
+        for hook in hooks:
+            remove_stage_hook(hook)
+            if isinstance(hook, StageLog):
+                hook.close()
+
+
+def _stage(function: str, stage: str, start: float, nbytes: int = 0, samples: int = 0) -> float:
+    """Report stage, started at ``start``, to all hooks; return start time for the next stage, hooks time excluded."""
+
+    seconds = perf_counter() - start
+    for hook in _STAGE_HOOKS:
+        hook(function, stage, seconds, nbytes, samples)
+    return perf_counter()
+
+
+class StageLog:
+    """Stage hook writing each stage report as one JSON line.
+
+    :param out_file: name of the log file, appended to,
+        or writable text file-like object, like ``sys.stderr``,
+        which is left open upon closing.
+
+    """
+
+    def __init__(self, out_file) -> None:
+        self._own_file = not hasattr(out_file, 'write')
+        self._file = open(out_file, 'a', encoding='utf-8') if self._own_file else out_file
+
+    def __call__(self, function: str, stage: str, seconds: float, nbytes: int, samples: int) -> None:
+        self._file.write(json.dumps({'time': time(), 'function': function, 'stage': stage, 'seconds': seconds, 'bytes': nbytes, 'samples': samples}) + '\n')
+
+    def close(self) -> None:
+        """Close log file, or flush stream."""
+
+        if self._own_file:
+            self._file.close()
+        else:
+            self._file.flush()
+
+
+class StageProfile:
+    """Stage hook summing stages up in ``cProfile`` format.
+
+    Each ``function: stage`` pair is shown as separate "function" by ``pstats``,
+    calls counted and time summed::
+
+        pstats.Stats(profile).sort_stats('tottime').print_stats()
+
+    or dumped with ``dump_stats`` to file, readable with ``python -m pstats``
+    and ``cProfile`` visualization tools.
+
+    """
+
+    def __init__(self) -> None:
+        self._totals = {}
+        self.stats = {}
+
+    def __call__(self, function: str, stage: str, seconds: float, nbytes: int, samples: int) -> None:
+        key = ('pypnm', 0, f'{function}: {stage}')
+        calls, primitive_calls, total_time, cumulative_time, callers = self._totals.get(key, (0, 0, 0.0, 0.0, {}))
+        self._totals[key] = (calls + 1, primitive_calls + 1, total_time + seconds, cumulative_time + seconds, callers)
+
+    def create_stats(self) -> None:
+        """Copy totals so far to ``stats``, like ``cProfile.Profile``; called by ``pstats.Stats``."""
+
+        self.stats = {key: (*totals[0:4], dict(totals[4])) for key, totals in self._totals.items()}  # Own copy, pstats.Stats empties it
+
+    def dump_stats(self, filename) -> None:
+        """Write stats to file in ``cProfile.Profile.dump_stats`` format."""
+
+        self.create_stats()
+        with open(filename, 'wb') as file:
+            marshal.dump(self.stats, file)
+# ↑ End of stage timing hooks
+
+""" ╔══════════════════════════════╗
+    ║      PNM header parsing      ║
+    ╚══════════════════════════════╝ """
+
+# ↓ Header patterns. Last \s in each line gives better compatibility than [\r\n],
+#   first \s further improves compatibility. Note that for 1 bit pattern does not include maxcolors.
+#   Comment runs up to line break, required, so that comment cut by the end of partial read
+#   is never taken for numbers, but makes pattern fail until the rest of header is read.
+_PNM_HEADER = (
+    rb'(P\d)\s(?:\s*#[^\r\n]*[\r\n])*'
+    rb'\s*(\d+)\s(?:\s*#[^\r\n]*[\r\n])*'
+    rb'\s*(\d+)\s(?:\s*#[^\r\n]*[\r\n])*'
+    rb'\s*(\d+)\s'
+)
+_PBM_HEADER = (
+    rb'(P\d)\s(?:\s*#[^\r\n]*[\r\n])*'
+    rb'\s*(\d+)\s(?:\s*#[^\r\n]*[\r\n])*'
+    rb'\s*(\d+)\s'
+)
+# ↓ PAM header is a set of "KEYWORD value" lines, comments included, up to ENDHDR
+_PAM_HEADER = rb'(P7)\r?\n((?:.*\n)*?)ENDHDR\r?\n'
+_COMMENT = re.compile(rb'#[^\r\n]*')
+_WHITESPACE = b' \t\n\v\f\r'
+
+
+def _pnm_header(buffer) -> tuple[str, int, int, int, int, int]:
+    """Parse PNM header at the very beginning of ``buffer`` without copying the rest of it.
+
+    :param buffer: bytes-like object (``bytes``, ``mmap``, ``memoryview``)
+        starting with PNM header;
+    :return magic, X, Y, Z, maxcolors, offset: tuple, consisting of:
+
+    - ``magic``: PNM type, 'P1' to 'P7' (str);
+    - ``X``, ``Y``, ``Z``: PNM image dimensions (int);
+    - ``maxcolors``: maximum value of color per channel (int),
+      for 1 bit PBM images forced to 255 since they get promoted to 8 bit L;
+    - ``offset``: position of the first raster byte in ``buffer`` (int).
+
+    """
+
+    beginnings = bytes(buffer[0:2])  # First two bytes 'Pn'
+    if beginnings not in (b'P1', b'P2', b'P3', b'P4', b'P5', b'P6', b'P7'):
+        raise ValueError(f'Header {beginnings} is not in P1:P7 range')
+    magic = beginnings.decode('ascii')
+
+    if magic == 'P7':  # PAM header with keywords
+        header = re.match(_PAM_HEADER, buffer)
+        if header is None:
+            raise ValueError('Broken P7 header')
+        keywords = {}
+        for line in header.group(2).splitlines():
+            line = line.split(b'#')[0].split()
+            if line:
+                keywords[line[0].decode('ascii', errors='replace')] = line[1:]
+        try:
+            X, Y, Z, maxcolors = (int(keywords[key][0]) for key in ('WIDTH', 'HEIGHT', 'DEPTH', 'MAXVAL'))
+        except (KeyError, IndexError, ValueError):
+            raise ValueError('Broken P7 header') from None
+        return (magic, X, Y, Z, maxcolors, header.end())
+
+    if magic in ('P1', 'P4'):  # 1 bit header has no maxcolors
+        header = re.match(_PBM_HEADER, buffer)
+    else:
+        header = re.match(_PNM_HEADER, buffer)
+    if header is None:
+        raise ValueError(f'Broken {magic} header')
+
+    X = int(header.group(2))
+    Y = int(header.group(3))
+    Z = 3 if magic in ('P3', 'P6') else 1
+    maxcolors = 255 if magic in ('P1', 'P4') else int(header.group(4))
+
+    return (magic, X, Y, Z, maxcolors, header.end())
+# ↑ End of '_pnm_header' header parsing function
+
+
+""" ╔══════════════════════════════╗
+    ║    PNMImage flat container   ║
+    ╚══════════════════════════════╝ """
+
+
+class PNMImage:
+    """Compact image container, keeping all samples in one flat ``array``.
+
+    Samples are stored row by row, pixel by pixel, channel by channel,
+    i.e. sample (x, y, z) is ``data[z + x * Z + y * X * Z]``.
+    For 8 bit images ``data`` is ``array('B')``, for 16 bit - ``array('H')``,
+    taking 1 or 2 bytes per sample instead of a Python list per pixel.
+
+    :param int X, Y, Z: image dimensions;
+    :param int maxcolors: number of colors per channel, either 255, or 65535;
+    :param data: flat image data, one item per sample; ``array`` of matching type
+        is kept as is, anything else, like ``bytearray``, ``memoryview``
+        or ``array`` of other type, is copied to new ``array``;
+        if omitted, image is filled with zeroes.
+    :type data: array.array | bytes | bytearray | memoryview | None
+
+    """
+
+    __slots__ = ('X', 'Y', 'Z', 'maxcolors', 'data')
+
+    def __init__(self, X: int, Y: int, Z: int, maxcolors: int, data: array.array | None = None) -> None:
+        self.X = X
+        self.Y = Y
+        self.Z = Z
+        self.maxcolors = maxcolors
+        typecode = 'B' if maxcolors < 256 else 'H'
+        if data is None:
+            data = array.array(typecode, bytes(X * Y * Z * array.array(typecode).itemsize))
+        elif len(data) != X * Y * Z:
+            raise ValueError(f'Data length {len(data)} does not match {X} * {Y} * {Z} image size')
+        elif not (isinstance(data, array.array) and data.typecode == typecode):
+            # ↓ Same type contiguous buffer copied at once, anything else item by item
+            try:
+                view = memoryview(data)
+            except TypeError:  # Not a buffer, like list
+                view = None
+            if view is not None and view.format == typecode and view.contiguous:
+                data = array.array(typecode)
+                data.frombytes(view.cast('B'))
+            else:
+                data = array.array(typecode, data if view is None else view.tolist())  # Bytes would be taken as raw memory otherwise
+        self.data = data
+
+    def __repr__(self) -> str:
+        return f'PNMImage(X={self.X}, Y={self.Y}, Z={self.Z}, maxcolors={self.maxcolors})'
+
+    def row(self, y: int) -> memoryview:
+        """Return writable view of row ``y`` as flat sequence of X * Z samples."""
+
+        row_length = self.X * self.Z
+        return memoryview(self.data)[y * row_length : (y + 1) * row_length]
+
+    def pixel(self, x: int, y: int) -> memoryview:
+        """Return writable view of pixel (``x``, ``y``) as sequence of Z samples."""
+
+        start = (x + y * self.X) * self.Z
+        return memoryview(self.data)[start : start + self.Z]
+# ↑ End of 'PNMImage' class
+
+
+def list2image(list_3d: list[list[list[int]]], maxcolors: int) -> PNMImage:
+    """Convert nested image data list to flat ``PNMImage``.
+
+    :param list_3d: image as list (image) of lists (rows) of lists (pixels)
+        of ints (channels);
+    :type list_3d: list[list[list[int]]]
+    :param int maxcolors: number of colors per channel for current image,
+        either 255, or 65535;
+    :return: flat image container.
+    :rtype: PNMImage
+
+    """
+
+    # ↓ Image X, Y, Z sizes
+    Y, X, Z = (len(list_3d), len(list_3d[0]), len(list_3d[0][0]))
+
+    # ↓ Flattening 3D list, chaining rows and then pixels
+    data = array.array('B' if maxcolors < 256 else 'H', chain.from_iterable(chain.from_iterable(list_3d)))
+
+    return PNMImage(X, Y, Z, maxcolors, data)
+# ↑ End of 'list2image' nested list to flat image conversion
+
+
+def image2list(image: PNMImage) -> list[list[list[int]]]:
+    """Convert flat ``PNMImage`` to nested image data list.
+
+    :param PNMImage image: flat image container;
+    :return: list (image) of lists (rows) of lists (pixels)
+        of ints (channels).
+    :rtype: list[list[list[int]]]
+
+    """
+
+    X, Y, Z = image.X, image.Y, image.Z
+    data = image.data
+    row_length = X * Z
+
+    # ↓ Millions of new lists trigger cyclic garbage collection passes over
+    #   the whole growing image for nothing, therefore it is paused
+    start = perf_counter() if _STAGE_HOOKS else None
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        if Z == 1:
+            # ↓ One channel, like L or promoted 1 bit: wrapping samples of row slice, faster than zip
+            list_3d = [[[sample] for sample in data[y * row_length : (y + 1) * row_length]] for y in range(Y)]
+        else:
+            # ↓ Reshaping flat array to 3D list row by row: zipping channel slices to pixels
+            list_3d = [list(map(list, zip(*(data[y * row_length + z : (y + 1) * row_length : Z] for z in range(Z))))) for y in range(Y)]
+    finally:
+        if gc_enabled:
+            gc.enable()
+    if start is not None:
+        _stage('image2list', 'reshape', start, 0, len(data))
+
+    return list_3d
+# ↑ End of 'image2list' flat image to nested list conversion
+
+
+""" ╔══════════════════════════════╗
+    ║   Raster decoding helpers    ║
+    ╚══════════════════════════════╝ """
+
+
+def _ascii_chunks(buffer, offset: int, chunk_size: int = 1048576) -> Iterator[list[bytes]]:
+    """Split ASCII raster of ``buffer``, starting at ``offset``, to whitespace-separated tokens chunk by chunk.
+
+    Token or comment cut by chunk border is carried over to next chunk,
+    so memory used depends on ``chunk_size``, not on ``buffer`` size.
+    Comments, from ``#`` to the end of line, are removed, same as in header.
+
+    """
+
+    tail = b''
+    end = len(buffer)
+    for position in range(offset, end, chunk_size):
+        chunk = tail + buffer[position : position + chunk_size]
+        if position + chunk_size < end:
+            comment = chunk.rfind(b'#')
+            if comment >= 0 and chunk.find(b'\n', comment) < 0 and chunk.find(b'\r', comment) < 0:
+                cut = comment  # Comment may continue in next chunk
+            else:
+                cut = max(map(chunk.rfind, _WHITESPACE)) + 1  # Last token may continue in next chunk
+            chunk, tail = chunk[0:cut], chunk[cut:]
+        else:
+            tail = b''
+        if b'#' in chunk:
+            chunk = _COMMENT.sub(b' ', chunk)
+        yield chunk.split()
+# ↑ End of '_ascii_chunks' tokenizer
+
+
+def _ascii_rows(chunks: Iterator[list[bytes]], row_length: int) -> Iterator[list[bytes]]:
+    """Regroup token chunks from ``_ascii_chunks`` into rows of ``row_length`` tokens."""
+
+    pending = []
+    for tokens in chunks:
+        pending.extend(tokens)
+        start = 0
+        while len(pending) - start >= row_length:
+            yield pending[start : start + row_length]
+            start += row_length
+        del pending[0:start]
+# ↑ End of '_ascii_rows' row regrouping
+
+
+# ↓ 1 bit lookup tables, promoting ink on (1) to 0 and ink off (0) to 255 of 8 bit L:
+#   P4 byte to 8 samples, and P1 char to sample
+_P4_TABLE = tuple(bytes(255 * (1 - ((single_byte >> (7 - bit)) & 1)) for bit in range(8)) for single_byte in range(256))
+_P1_TABLE = bytes.maketrans(b'01', b'\xff\x00')
+# ↓ P7 BLACKANDWHITE lookup table, promoting 1 (white) to 255 of 8 bit L
+_PAM_BW_TABLE = bytes.maketrans(b'\x01', b'\xff')
+
+
+def _p4_row(row_bytes: bytes, X: int) -> bytes:
+    """Unpack one row of P4 packed bits to ``X`` 8 bit L samples at once, using ``_P4_TABLE``."""
+
+    # ↓ Unpacking whole row, then cutting junk bits of last byte off
+    return b''.join(map(_P4_TABLE.__getitem__, row_bytes))[0:X]
+# ↑ End of '_p4_row' bits unpacking
+
+
+""" ╔══════════════════════════════╗
+    ║        Raster decoding       ║
     ╟──────────────────────────────╢
     ║ WARNING: internal functions  ║
     ║ do not perform format check! ║
     ╚══════════════════════════════╝ """
 
 
-def pnm2list(in_filename: str) -> tuple[int, int, int, int, list[list[list[int]]]]:
-    """Read PBM, PGM or PPM file to nested image data list.
+def _decode_raster(buffer, magic: str, X: int, Y: int, Z: int, maxcolors: int, offset: int) -> tuple[int, array.array]:
+    """Decode image data of ``buffer``, starting at ``offset`` right after header, to flat array.
 
-    :param str in_filename: input file name;
+    :param buffer: bytes-like object (``bytes``, ``mmap``, ``memoryview``);
+    :param str magic: PNM type, as returned by ``_pnm_header``;
+    :param int X, Y, Z: image dimensions;
+    :param int maxcolors: maximum value of color per channel from header;
+    :param int offset: position of the first raster byte;
+    :return maxcolors, array_1d: ``maxcolors`` (changed to 255 for 1 bit images,
+        promoted to 8 bit L) and flat array of samples.
+
+    """
+
+    start = perf_counter() if _STAGE_HOOKS else None
+
+    """ ┌───────────────────────────┐
+        │ IF Binary continuous tone │
+        └───────────────────────────┘ """
+    if magic in ('P5', 'P6', 'P7'):
+        # ↓ Converting raster bytes, read in place after header, to array
+        array_1d = array.array('B' if maxcolors < 256 else 'H')
+        if offset + X * Y * Z * array_1d.itemsize > len(buffer):
+            raise ValueError(f'{magic} image data is truncated')
+        with memoryview(buffer) as raster:
+            array_1d.frombytes(raster[offset : offset + X * Y * Z * array_1d.itemsize])
+        # ↑ got image data as `array_1d` array, no intermediate copy of file made
+        if start is not None:
+            start = _stage('decode', f'{magic} frombytes', start, len(array_1d) * array_1d.itemsize, len(array_1d))
+
+        if maxcolors > 255:
+            array_1d.byteswap()  # Critical for 16 bits per channel
+            if start is not None:
+                start = _stage('decode', f'{magic} byteswap', start, len(array_1d) * 2, len(array_1d))
+        elif maxcolors == 1:  # PAM BLACKANDWHITE, forcing conversion to 8 bit L
+            array_1d = array.array('B', array_1d.tobytes().translate(_PAM_BW_TABLE))
+            maxcolors = 255
+            if start is not None:
+                start = _stage('decode', f'{magic} translate', start, len(array_1d), len(array_1d))
+
+        """ ┌──────────────────────────┐
+            │ IF ASCII continuous tone │
+            └──────────────────────────┘ """
+    elif magic in ('P2', 'P3'):
+        # ↓ Converting raster, tokenized in place after header chunk by chunk, to array of int
+        needed = X * Y * Z
+        array_1d = array.array('B' if maxcolors < 256 else 'H')
+        converting = 0.0  # Time of int conversion, told from tokenizing when stages are reported
+        for tokens in _ascii_chunks(buffer, offset):
+            del tokens[needed - len(array_1d) :]  # Anything after image data ignored, not converted
+            if start is None:
+                array_1d.fromlist(list(map(int, tokens)))
+            else:
+                converted = perf_counter()
+                array_1d.fromlist(list(map(int, tokens)))
+                converting += perf_counter() - converted
+            if len(array_1d) >= needed:
+                break
+        if start is not None:
+            _stage('decode', f'{magic} tokenize', start + converting, len(buffer) - offset)
+            start = _stage('decode', f'{magic} int', perf_counter() - converting, 0, len(array_1d))
+
+        """ ┌───────────────────────┐
+            │ IF Binary 1 Bit/pixel │
+            └───────────────────────┘ """
+    elif magic == 'P4':
+        # ↓ Converting packed bits to array of int row by row with lookup table,
+        #   inverting values and multiplying by maxcolors to obtain 8 bit L.
+        row_width = (X + 7) // 8  # Rounded up version of width, to get whole bytes including junk at EOLNs
+        if offset + row_width * Y > len(buffer):
+            raise ValueError('P4 image data is truncated')
+        array_1d = array.array('B')
+        for y in range(Y):
+            array_1d.frombytes(_p4_row(buffer[offset + y * row_width : offset + (y + 1) * row_width], X))
+        if start is not None:
+            start = _stage('decode', 'P4 unpack', start, row_width * Y, len(array_1d))
+
+        """ ┌──────────────────────┐
+            │ IF ASCII 1 Bit/pixel │
+            └──────────────────────┘ """
+    elif magic == 'P1':
+        # ↓ Converting chars to 8 bit L samples with lookup table chunk by chunk,
+        #   tokens being joined since whitespace between P1 samples is optional.
+        array_1d = array.array('B')
+        for tokens in _ascii_chunks(buffer, offset):
+            array_1d.frombytes(b''.join(tokens)[0 : X * Y - len(array_1d)].translate(_P1_TABLE))  # Anything after image data ignored
+            if len(array_1d) >= X * Y:
+                break
+        if start is not None:
+            start = _stage('decode', 'P1 tokenize', start, len(buffer) - offset, len(array_1d))
+
+    else:
+        raise ValueError(f'Header {magic} is not in P1:P7 range')
+
+    return (maxcolors, array_1d)
+# ↑ End of '_decode_raster' function
+
+
+""" ╔══════════════════════════════╗
+    ║           pnm2list           ║
+    ╚══════════════════════════════╝ """
+
+
+def pnm2list(in_filename, flat: bool = False, workers: int | None = None) -> tuple[int, int, int, int, list[list[list[int]]] | PNMImage]:
+    """Read PBM, PGM, PPM or PAM file to nested image data list.
+
+    :param in_filename: input file name (memory-mapped for reading),
+        or PNM data in memory as ``bytes``, ``bytearray`` or ``memoryview``,
+        or binary file-like object with ``read()``, like ``sys.stdin.buffer`` pipe;
+    :type in_filename: str | PathLike | bytes | bytearray | memoryview | BinaryIO
+    :param bool flat: if set ``True``, return image as flat ``PNMImage``
+        instead of nested list;
+    :param workers: if set above 1, ASCII file given by name is decoded
+        by that many processes, each tokenizing its own part of file mapping;
+        binary raster is always decoded in current process;
+        default ``None`` means decoding in current process;
+    :type workers: int | None
     :return X, Y, Z, maxcolors, list_3d: tuple, consisting of:
 
     - ``X``, ``Y``, ``Z``: PNM image dimensions (int);
     - ``maxcolors``: number of colors per channel for current image (int),
       either 255, or 65535;
     - ``list_3d``: list (image) of lists (rows) of lists (pixels)
-      of ints (channel values).
+      of ints (channel values), or ``PNMImage`` if ``flat`` is ``True``.
+
+    .. note:: File-like object is read up to the end of the first image,
+        and maybe a bit further due to read-ahead; use ``pnm_frames``
+        for multi-image streams.
 
     """
 
-    """ ┌───────────────────────────┐
-        │ IF Binary continuous tone │
-        └───────────────────────────┘ """
+    if workers is not None and workers > 1 and isinstance(in_filename, (str, PathLike)):
+        return _pnm2list_parallel(in_filename, flat, workers)
+
+    start = perf_counter() if _STAGE_HOOKS else None
 
-    def _p65(in_filename: str) -> tuple[int, int, int, int, list[list[list[int]]]]:
-        """Open P6 and P5 PNM."""
+    if isinstance(in_filename, (str, PathLike)):  # Real file, mapped to memory
         with open(in_filename, 'rb') as file:  # Open file for mmap
             with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as full_bytes_mmap:
-                # ↓ Getting header by pattern
-                header = search(
-                    rb'(^P\d\s(?:\s*#.*\s)*'  # last \s gives better compatibility than [\r\n]
-                    rb'\s*(\d+)\s(?:\s*#.*\s)*'  # first \s further improves compatibility
-                    rb'\s*(\d+)\s(?:\s*#.*\s)*'
-                    rb'\s*(\d+)\s)',
-                    full_bytes_mmap,
-                ).groups()
-
-                # ↓ Splitting header into image properties values
-                magic, X, Y, maxcolors = header
-                magic = (magic.split()[0]).decode('ascii')
-                X = int(X)
-                Y = int(Y)
-                Z = 3 if magic == 'P6' else 1  # assuming P5 is the only alternative to P6
-                maxcolors = int(maxcolors)
-
-                # ↓ Removing header by the same pattern, leaving only image data
-                filtered_bytes = sub(
-                    rb'(^P\d\s(?:\s*#.*\s)*'  # pattern to replace to
-                    rb'\s*(\d+)\s(?:\s*#.*\s)*'
-                    rb'\s*(\d+)\s(?:\s*#.*\s)*'
-                    rb'\s*(\d+)\s)',
-                    b'',  # empty space to replace pattern with
-                    full_bytes_mmap,
-                )
-        # ↑ got copy of file without header as `filtered_bytes` bytes
-
-        # ↓ Converting bytes to array
-        if maxcolors < 256:
-            array_1d = array.array('B', filtered_bytes)
-        else:
-            array_1d = array.array('H', filtered_bytes)
-            array_1d.byteswap()  # Critical for 16 bits per channel
-        del filtered_bytes  # Cleanup
+                # ↓ Getting image properties and raster offset from header, format check ensued
+                magic, X, Y, Z, maxcolors, offset = _pnm_header(full_bytes_mmap)
+                if start is not None:
+                    start = _stage('pnm2list', 'header', start, offset)
+                # ↓ Decoding raster in place after header
+                maxcolors, array_1d = _decode_raster(full_bytes_mmap, magic, X, Y, Z, maxcolors, offset)
+
+    elif hasattr(in_filename, 'read'):  # File-like object, possibly non-seekable pipe
+        frame = _read_frame(_StreamBuffer(in_filename))
+        if frame is None:
+            raise ValueError('No PNM image in stream')
+        magic, X, Y, Z, maxcolors, offset, frame_bytes = frame
+        maxcolors, array_1d = _decode_raster(frame_bytes, magic, X, Y, Z, maxcolors, offset)
+        del frame_bytes  # Cleanup
+
+    else:  # Bytes-like object, decoded in place
+        magic, X, Y, Z, maxcolors, offset = _pnm_header(in_filename)
+        if start is not None:
+            start = _stage('pnm2list', 'header', start, offset)
+        maxcolors, array_1d = _decode_raster(in_filename, magic, X, Y, Z, maxcolors, offset)
+
+    image = PNMImage(X, Y, Z, maxcolors, array_1d)
+    del array_1d  # Cleanup
+
+    if flat:
+        return (X, Y, Z, maxcolors, image)
+    else:
+        return (X, Y, Z, maxcolors, image2list(image))
+# ↑ End of pnm2list PNM reading function
 
-        # ↓ Converting array to list
-        list_1d = array_1d.tolist()
-        del array_1d  # Cleanup
 
-        # ↓ Reshaping flat 1D list to 3D list
-        list_3d = [[[list_1d[z + x * Z + y * X * Z] for z in range(Z)] for x in range(X)] for y in range(Y)]
-        del list_1d  # Cleanup
+""" ╔══════════════════════════════╗
+    ║   Parallel ASCII decoding    ║
+    ╚══════════════════════════════╝ """
 
-        return (X, Y, Z, maxcolors, list_3d)
 
-    """ ┌──────────────────────────┐
-        │ IF ASCII continuous tone │
-        └──────────────────────────┘ """
+def _decode_ascii_range(in_filename, magic: str, start: int, end: int, maxcolors: int) -> tuple[array.array, bytes | None]:
+    """Decode ASCII raster tokens between ``start`` and ``end`` positions in worker process.
 
-    def _p32(in_filename: str) -> tuple[int, int, int, int, list[list[list[int]]]]:
-        """Open P3 and P2 PNM."""
-        with open(in_filename, 'r') as file:  # Open file for mmap
-            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as full_bytes_mmap:
-                # ↓ Getting header by pattern
-                header = search(
-                    rb'(^P\d\s(?:\s*#.*\s)*'  # last \s gives better compatibility than [\r\n]
-                    rb'\s*(\d+)\s(?:\s*#.*\s)*'  # first \s further improves compatibility
-                    rb'\s*(\d+)\s(?:\s*#.*\s)*'
-                    rb'\s*(\d+)\s)',
-                    full_bytes_mmap,
-                ).groups()
-
-                # ↓ Splitting header into image properties values
-                magic, X, Y, maxcolors = header
-                magic = (magic.split()[0]).decode('ascii')
-                X = int(X)
-                Y = int(Y)
-                Z = 3 if (magic == 'P3') else 1  # assuming P2 is the only alternative to P3
-                maxcolors = int(maxcolors)
-
-                # ↓ Removing header by the same pattern, leaving only image data
-                filtered_chars = sub(
-                    rb'(^P\d\s(?:\s*#.*\s)*'  # pattern to replace to
-                    rb'\s*(\d+)\s(?:\s*#.*\s)*'
-                    rb'\s*(\d+)\s(?:\s*#.*\s)*'
-                    rb'\s*(\d+)\s)',
-                    b'',  # empty space to replace pattern with
-                    full_bytes_mmap,
-                ).decode('ascii')
-        # ↑ got copy of file without header as `filtered_chars` str
-
-        # ↓ Converting to 1D list of strings, ignoring any formatting
-        list_1d = filtered_chars.split()
-        del filtered_chars  # Cleanup
-
-        # ↓ Converting 1D list of strings to 3D list of int
-        list_3d = [[[int(list_1d[z + x * Z + y * X * Z]) for z in range(Z)] for x in range(X)] for y in range(Y)]
-        del list_1d  # Cleanup
-
-        return (X, Y, Z, maxcolors, list_3d)
-
-    """ ┌───────────────────────┐
-        │ IF Binary 1 Bit/pixel │
-        └───────────────────────┘ """
-
-    def _p4(in_filename: str) -> tuple[int, int, int, int, list[list[list[int]]]]:
-        """Open P4 PNM."""
-        with open(in_filename, 'rb') as file:  # Open file for mmap
-            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as full_bytes_mmap:
-                # ↓ Getting header by pattern. Note that for 1 bit pattern does not include maxcolors
-                header = search(
-                    rb'(^P\d\s(?:\s*#.*\s)*'  # last \s gives better compatibility than [\r\n]
-                    rb'\s*(\d+)\s(?:\s*#.*\s)*'  # first \s further improves compatibility
-                    rb'\s*(\d+)\s)',
-                    full_bytes_mmap,
-                ).groups()
-
-                # ↓ Splitting header into image properties values
-                magic, X, Y = header
-                magic = (magic.split()[0]).decode('ascii')
-                X = int(X)
-                Y = int(Y)
-                Z = 1
-                maxcolors = 255  # Forcing conversion to 8 bit L
-
-                # ↓ Removing header by the same pattern, leaving only image data
-                filtered_bytes = sub(
-                    rb'(^P\d\s(?:\s*#.*\s)*'  # pattern to replace to
-                    rb'\s*(\d+)\s(?:\s*#.*\s)*'
-                    rb'\s*(\d+)\s)',
-                    b'',  # empty space to replace pattern with
-                    full_bytes_mmap,
-                )
-        # ↑ got copy of file without header as `filtered_bytes` bytes
-
-        # ↓ Converting packed bits from bytes to 3D list of int, inverting values,
-        #   and multiplying by maxcolors to obtain 8 bit L.
-        row_width = (X + 7) // 8  # Rounded up version of width, to get whole bytes including junk at EOLNs
-        list_3d = []
-        for y in range(Y):
-            row = []
-            for x in range(row_width):
-                single_byte = filtered_bytes[(y * row_width) + x]
-                # ↓ Unpacking bytes to int(bits), including artificial junk in a last one in a row
-                single_byte_bits = [int(bit) for bit in bin(single_byte)[2:].zfill(8)]
-                # ↓ renormalizing colors from ink on/off to L model, replacing int with [int]
-                single_byte_bits_normalized = [[maxcolors * (1 - c)] for c in single_byte_bits]
-                # ↓ assembling row, junk at the end included
-                row.extend(single_byte_bits_normalized)
-            # ↓ Assembling image from rows, cutting junk off in the process
-            list_3d.append(row[0:X])
-
-        return (X, Y, Z, maxcolors, list_3d)
-
-    """ ┌──────────────────────┐
-        │ IF ASCII 1 Bit/pixel │
-        └──────────────────────┘ """
-
-    def _p1(in_filename: str) -> tuple[int, int, int, int, list[list[list[int]]]]:
-        """Open P1 PNM."""
-        with open(in_filename, 'r') as file:  # Open file for mmap
-            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as full_bytes_mmap:
-                # ↓ Getting header by pattern. Note that for 1 bit pattern does not include maxcolors
-                header = search(
-                    rb'(^P\d\s(?:\s*#.*\s)*'  # last \s gives better compatibility than [\r\n]
-                    rb'\s*(\d+)\s(?:\s*#.*\s)*'  # first \s further improves compatibility
-                    rb'\s*(\d+)\s)',
-                    full_bytes_mmap,
-                ).groups()
-
-                # ↓ Splitting header into image properties values
-                magic, X, Y = header
-                magic = magic.split()[0].decode('ascii')
-                X = int(X)
-                Y = int(Y)
-                Z = 1
-                maxcolors = 255  # Forcing conversion to 8 bit L
-
-                # ↓ Removing header by the same pattern, leaving only image data
-                filtered_chars = sub(
-                    rb'(^P\d\s(?:\s*#.*\s)*'  # pattern to replace to
-                    rb'\s*(\d+)\s(?:\s*#.*\s)*'
-                    rb'\s*(\d+)\s)',
-                    b'',  # empty space to replace pattern with
-                    full_bytes_mmap,
-                ).decode('ascii')
-        # ↑ got copy of file without header as `filtered_chars` str
-
-        # ↓ Converting to single str, removing any formatting
-        str_1d = ''.join(filtered_chars.split())
-        del filtered_chars  # Cleanup
-
-        # ↓ Converting str to 3D list of int,
-        #   inverting values and multiplying by maxcolors to obtain 8 bit L.
-        list_3d = [[[maxcolors * (1 - int(str_1d[x + y * X]))] for x in range(X)] for y in range(Y)]
-        del str_1d  # Cleanup
-
-        return (X, Y, Z, maxcolors, list_3d)
-
-    """ ┌─────────────────────────┐
-        │ PNM header type switch. │
-        │   Format check ensued.  │
-        └─────────────────────────┘ """
-    with open(in_filename, 'rb') as file:  # Open file in binary mode
-        beginnings = file.read(2)  # Read first two bytes 'Pn' and close file
-
-    if beginnings.startswith(b'P6'):  # Binary PPM
-        return _p65(in_filename)
-    elif beginnings.startswith(b'P5'):  # Binary PGM
-        return _p65(in_filename)
-    elif beginnings.startswith(b'P4'):  # Binary PBM
-        return _p4(in_filename)
-    elif beginnings.startswith(b'P3'):  # ASCII PPM
-        return _p32(in_filename)
-    elif beginnings.startswith(b'P2'):  # ASCII PGM
-        return _p32(in_filename)
-    elif beginnings.startswith(b'P1'):  # ASCII PBM
-        return _p1(in_filename)
+    Token crossing ``start`` belongs to previous range, token crossing ``end`` belongs to this one.
+    Range may run past image data, into next image or trailing text of the file, so decoding
+    stops at the first token which is not a sample; caller counts samples and drops the rest.
+
+    :return array_1d, stop: samples decoded, and token decoding stopped at, or ``None``.
+
+    """
+
+    with open(in_filename, 'rb') as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as full_bytes_mmap:
+            size = len(full_bytes_mmap)
+            # ↓ Moving range borders to whitespace
+            while start < end and full_bytes_mmap[start - 1] not in _WHITESPACE:
+                start += 1
+            while end < size and full_bytes_mmap[end - 1] not in _WHITESPACE:
+                end += 1
+            tokens = full_bytes_mmap[start:end].split()
+
+    if magic == 'P1':
+        digits = b''.join(tokens)
+        end = re.match(rb'[01]*', digits).end()
+        return (array.array('B', digits[0:end].translate(_P1_TABLE)), digits[end : end + 1] or None)
+
+    array_1d = array.array('B' if maxcolors < 256 else 'H')
+    try:
+        array_1d.fromlist(list(map(int, tokens)))
+    except (ValueError, OverflowError):  # Not a sample, like next image header; keeping samples up to it
+        limit = 255 if maxcolors < 256 else 65535
+        for token in tokens:
+            if not token.isdigit() or int(token) > limit:
+                return (array_1d, token)
+            array_1d.append(int(token))
+    return (array_1d, None)
+# ↑ End of '_decode_ascii_range' function
+
+
+def _pnm2list_parallel(in_filename, flat: bool, workers: int) -> tuple[int, int, int, int, list[list[list[int]]] | PNMImage]:
+    """Read PNM file like ``pnm2list``, splitting ASCII tokenizing between ``workers`` processes.
+
+    ASCII raster is split to ranges of bytes, decoded to flat arrays,
+    joined in original order, and turned to nested list once, in current process.
+    Binary raster decoding is bound by copying rather than by CPU, so passing
+    results between processes costs more than it saves; binary raster,
+    as well as ASCII raster containing comments, which can not be split safely,
+    is decoded in current process.
+
+    """
+
+    with open(in_filename, 'rb') as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as full_bytes_mmap:
+            magic, X, Y, Z, maxcolors, offset = _pnm_header(full_bytes_mmap)
+            size = len(full_bytes_mmap)
+            if magic not in ('P1', 'P2', 'P3') or full_bytes_mmap.find(b'#', offset) >= 0:
+                maxcolors, array_1d = _decode_raster(full_bytes_mmap, magic, X, Y, Z, maxcolors, offset)
+                image = PNMImage(X, Y, Z, maxcolors, array_1d)
+                return (X, Y, Z, maxcolors, image if flat else image2list(image))
+
+    if magic == 'P1':
+        Z = 1  # Promoted to 8 bit L
+
+    # ↓ Splitting raster to byte ranges, decoded to flat arrays. Image end is not known
+    #   before tokenizing, so ranges run up to the end of file; samples are taken in order
+    #   until image is complete, ranges after it, if any, being cancelled or dropped.
+    needed = X * Y * Z
+    step = -(-(size - offset) // workers)
+    starts = range(offset, size, step)
+    array_1d = array.array('B' if maxcolors < 256 else 'H')
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for band, stop in pool.map(_decode_ascii_range, repeat(in_filename), repeat(magic), starts, (min(start + step, size) for start in starts), repeat(maxcolors)):
+            array_1d.extend(band[0 : needed - len(array_1d)])
+            if len(array_1d) >= needed:
+                pool.shutdown(wait=False, cancel_futures=True)
+                break
+            if stop is not None:  # Image data broken by something else than sample
+                raise ValueError(f'{magic} image data contains {stop!r} instead of sample')
+    if len(array_1d) < needed:
+        raise ValueError(f'{magic} image data is truncated')
+    image = PNMImage(X, Y, Z, maxcolors, array_1d)
+    del array_1d  # Cleanup
+    return (X, Y, Z, maxcolors, image if flat else image2list(image))
+# ↑ End of '_pnm2list_parallel' function
+
+
+""" ╔══════════════════════════════╗
+    ║   pnm_info header-only probe ║
+    ╚══════════════════════════════╝ """
+
+
+class PNMInfo(NamedTuple):
+    """PNM image properties, as returned by ``pnm_info``.
+
+    ``maxcolors`` is the one ``pnm2list`` returns, i.e. 255 for 1 bit images
+    promoted to 8 bit L; ``raster_length`` is image data length in bytes
+    for binary formats, or ``None`` for ASCII ones.
+
+    """
+
+    magic: str
+    X: int
+    Y: int
+    Z: int
+    maxcolors: int
+    offset: int
+    raster_length: int | None
+    file_size: int
+
+
+def pnm_info(source) -> PNMInfo:
+    """Read PNM header only, without touching image data.
+
+    File is read with one small read, enlarged only if header is longer,
+    like header with long comments. For binary formats file size is checked
+    against image size from header.
+
+    :param source: input file name, or PNM data in memory as ``bytes``, ``bytearray`` or ``memoryview``;
+    :type source: str | PathLike | bytes | bytearray | memoryview
+    :return: image properties and raster location.
+    :rtype: PNMInfo
+
+    """
+
+    if isinstance(source, (str, PathLike)):
+        with open(source, 'rb') as file:
+            file_size = fstat(file.fileno()).st_size
+            head = file.read(512)
+            # ↓ Reading more only if header did not fit
+            while True:
+                try:
+                    magic, X, Y, Z, maxcolors, offset = _pnm_header(head)
+                    break
+                except ValueError:
+                    if len(head) >= file_size or len(head) > 65536 or not head.startswith((b'P1', b'P2', b'P3', b'P4', b'P5', b'P6', b'P7')):
+                        raise
+                    head += file.read(len(head))
     else:
-        raise ValueError(f'Header {beginnings} is not in P1:P6 range')
-# ↑ End of pnm2list PNM reading function
+        file_size = len(source)
+        magic, X, Y, Z, maxcolors, offset = _pnm_header(source)
+
+    if magic == 'P4':
+        raster_length = ((X + 7) // 8) * Y
+    elif magic in ('P5', 'P6', 'P7'):
+        raster_length = X * Y * Z * (1 if maxcolors < 256 else 2)
+    else:
+        raster_length = None
+    if raster_length is not None and offset + raster_length > file_size:
+        raise ValueError(f'{magic} image data is truncated: {file_size - offset} bytes instead of {raster_length}')
+
+    if magic == 'P7' and maxcolors == 1:
+        maxcolors = 255  # PAM BLACKANDWHITE, promoted to 8 bit L upon reading
+
+    return PNMInfo(magic, X, Y, Z, maxcolors, offset, raster_length, file_size)
+# ↑ End of 'pnm_info' function
+
+
+""" ╔══════════════════════════════╗
+    ║   pnm_open, pnm2buffer for   ║
+    ║ zero-copy P5:P7 reading      ║
+    ╚══════════════════════════════╝ """
+
+
+class PNMFile:
+    """Binary PGM (P5), PPM (P6) or PAM (P7) file, memory-mapped for reading in place.
+
+    Nothing is read or copied upon opening except header;
+    ``raster`` is a read-only ``memoryview`` of image data right inside the file mapping,
+    ordered row by row, pixel by pixel, channel by channel, exactly as in ``PNMImage``.
+    For 8 bit images every byte is one sample; for 16 bit images every sample
+    takes two bytes, big-endian, as stored in file.
+
+    Use as context manager to close file mapping upon exit::
+
+        with pnm_open(in_filename) as pnm:
+            first_row = bytes(pnm.row(0))
+
+    .. note:: Any views derived from ``raster`` must be released before closing.
+
+    :param str in_filename: input file name.
+
+    """
+
+    def __init__(self, in_filename: str) -> None:
+        with open(in_filename, 'rb') as file:  # File may be closed, mapping stays valid
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            self.magic, self.X, self.Y, self.Z, self.maxcolors, self.offset = _pnm_header(self._mmap)
+            if self.magic not in ('P5', 'P6', 'P7'):
+                raise ValueError(f'{self.magic} is not binary P5, P6 or P7')
+            length = self.X * self.Y * self.Z * (1 if self.maxcolors < 256 else 2)
+            if self.offset + length > len(self._mmap):
+                raise ValueError(f'{in_filename} raster is truncated')
+        except ValueError:
+            self._mmap.close()
+            raise
+
+        self.raster = memoryview(self._mmap)[self.offset : self.offset + length]
+
+    def __repr__(self) -> str:
+        return f'PNMFile(magic={self.magic!r}, X={self.X}, Y={self.Y}, Z={self.Z}, maxcolors={self.maxcolors})'
+
+    def __enter__(self) -> 'PNMFile':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def row(self, y: int) -> memoryview:
+        """Return read-only view of row ``y`` raster bytes."""
+
+        row_length = self.X * self.Z * (1 if self.maxcolors < 256 else 2)
+        return self.raster[y * row_length : (y + 1) * row_length]
+
+    def close(self) -> None:
+        """Release ``raster`` and close file mapping."""
+
+        self.raster.release()
+        self._mmap.close()
+# ↑ End of 'PNMFile' class
+
+
+def pnm_open(in_filename: str) -> PNMFile:
+    """Open binary PGM, PPM or PAM file for zero-copy reading; use as context manager.
+
+    :param str in_filename: input file name;
+    :return: memory-mapped file object with ``X``, ``Y``, ``Z``, ``maxcolors``
+        attributes and ``raster`` read-only ``memoryview`` of image data.
+    :rtype: PNMFile
+
+    """
+
+    return PNMFile(in_filename)
+# ↑ End of 'pnm_open' function
+
+
+def pnm2buffer(in_filename: str) -> tuple[int, int, int, int, memoryview]:
+    """Read binary PGM, PPM or PAM file to read-only buffer view without copying.
+
+    :param str in_filename: input file name;
+    :return X, Y, Z, maxcolors, raster: tuple, consisting of:
+
+    - ``X``, ``Y``, ``Z``: PNM image dimensions (int);
+    - ``maxcolors``: number of colors per channel for current image (int),
+      either 255, or 65535;
+    - ``raster``: read-only ``memoryview`` of image data inside file mapping;
+      for 16 bit images each sample takes two bytes, big-endian.
+      Mapping is kept open as long as ``raster`` is alive,
+      ``raster.release()`` closes it immediately.
+
+    """
+
+    pnm = PNMFile(in_filename)
+    # ↓ New view keeps mapping referenced after PNMFile own view is released
+    raster = memoryview(pnm._mmap)[pnm.offset : pnm.offset + len(pnm.raster)]
+    pnm.raster.release()
+
+    return (pnm.X, pnm.Y, pnm.Z, pnm.maxcolors, raster)
+# ↑ End of 'pnm2buffer' function
+
+
+""" ╔══════════════════════════════╗
+    ║        pnm_iter_rows         ║
+    ╚══════════════════════════════╝ """
+
+
+def pnm_iter_rows(in_filename: str, flat: bool = False) -> Iterator[tuple[int, int, int, int] | list[list[int]] | array.array]:
+    """Read PBM, PGM, PPM or PAM file row by row; memory used depends on row width, not on image size.
+
+    Generator yields image properties first, then image rows one by one::
+
+        rows = pnm_iter_rows(in_filename)
+        X, Y, Z, maxcolors = next(rows)
+        for row in rows:
+            ...
+
+    :param str in_filename: input file name;
+    :param bool flat: if set ``True``, yield rows as flat ``array`` of X * Z samples
+        instead of list of pixels;
+    :return: generator, yielding tuple ``(X, Y, Z, maxcolors)`` first,
+        then ``Y`` rows, each being list (row) of lists (pixels) of ints (channels),
+        or flat ``array`` if ``flat`` is ``True``.
+
+    """
+
+    with open(in_filename, 'rb') as file:  # Open file for mmap
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as full_bytes_mmap:
+            magic, X, Y, Z, maxcolors, offset = _pnm_header(full_bytes_mmap)
+            promote = magic == 'P7' and maxcolors == 1  # PAM BLACKANDWHITE, forcing conversion to 8 bit L
+            if promote:
+                maxcolors = 255
+            datatype = 'B' if maxcolors < 256 else 'H'
+            row_length = X * Z  # Samples per row
+
+            # ↓ Binary rows are fixed-size, so truncated file is detected before reading anything
+            if magic in ('P4', 'P5', 'P6', 'P7'):
+                row_bytes = (X + 7) // 8 if magic == 'P4' else row_length * (1 if datatype == 'B' else 2)
+                if offset + Y * row_bytes > len(full_bytes_mmap):
+                    raise ValueError(f'{magic} image data is truncated: {len(full_bytes_mmap) - offset} bytes instead of {Y * row_bytes}')
+
+            yield (X, Y, Z, maxcolors)
+
+            if magic in ('P5', 'P6', 'P7'):
+                # ↓ Fixed-size rows read in place at their offsets
+                rows = (full_bytes_mmap[offset + y * row_bytes : offset + (y + 1) * row_bytes] for y in range(Y))
+            elif magic == 'P4':
+                # ↓ Fixed-size rows of packed bits, rounded up to whole bytes
+                rows = (_p4_row(full_bytes_mmap[offset + y * row_bytes : offset + (y + 1) * row_bytes], X) for y in range(Y))
+            elif magic == 'P1':
+                # ↓ Every digit is a sample, whitespace optional; 1 bit inverted to 8 bit L with lookup table
+                chunks = (b''.join(tokens).translate(_P1_TABLE) for tokens in _ascii_chunks(full_bytes_mmap, offset))
+                rows = _ascii_rows(chunks, X)
+            else:  # P2 or P3
+                rows = (map(int, row) for row in _ascii_rows(_ascii_chunks(full_bytes_mmap, offset), row_length))
+
+            rows_read = 0
+            for row in islice(rows, Y):
+                if magic in ('P5', 'P6', 'P7'):
+                    row_array = array.array(datatype)
+                    row_array.frombytes(row.translate(_PAM_BW_TABLE) if promote else row)
+                    if maxcolors > 255:
+                        row_array.byteswap()  # Critical for 16 bits per channel
+                else:
+                    row_array = array.array(datatype, row)
+                rows_read += 1
+
+                if flat:
+                    yield row_array
+                else:
+                    row_list = row_array.tolist()
+                    yield [row_list[i : i + Z] for i in range(0, row_length, Z)]
+
+            # ↓ ASCII rows end with data, so truncated file shows up at the end only
+            if rows_read < Y:
+                raise ValueError(f'{magic} image data is truncated: {rows_read} rows instead of {Y}')
+# ↑ End of 'pnm_iter_rows' row generator
+
+
+""" ╔══════════════════════════════╗
+    ║  pnm_read_region for crops   ║
+    ╚══════════════════════════════╝ """
+
+
+def pnm_read_region(in_filename, box: tuple[int, int, int, int], flat: bool = False) -> tuple[int, int, int, int, list[list[list[int]]] | PNMImage]:
+    """Read rectangular region of PBM, PGM, PPM or PAM file.
+
+    For binary formats only bytes of region rows are read from file mapping,
+    so time depends on region size rather than on file size.
+    ASCII formats are decoded up to the last row of region and no further.
+
+    :param in_filename: input file name;
+    :type in_filename: str | PathLike
+    :param box: region as ``(x0, y0, x1, y1)``, left and top inclusive,
+        right and bottom exclusive, like Python slices;
+    :type box: tuple[int, int, int, int]
+    :param bool flat: if set ``True``, return region as flat ``PNMImage``
+        instead of nested list;
+    :return X, Y, Z, maxcolors, list_3d: tuple, same as for ``pnm2list``,
+        ``X`` and ``Y`` being region dimensions.
+
+    """
+
+    x0, y0, x1, y1 = box
+
+    with open(in_filename, 'rb') as file:  # Open file for mmap
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as full_bytes_mmap:
+            magic, X, Y, Z, maxcolors, offset = _pnm_header(full_bytes_mmap)
+            if not (0 <= x0 < x1 <= X and 0 <= y0 < y1 <= Y):
+                raise ValueError(f'Box {box} is outside {X} * {Y} image')
+
+            array_1d = array.array('B' if maxcolors < 256 else 'H')
+
+            if magic in ('P5', 'P6', 'P7'):
+                # ↓ Fixed-size rows, region part of each row read in place at its offset
+                sample_bytes = 1 if maxcolors < 256 else 2
+                row_bytes = X * Z * sample_bytes
+                if offset + Y * row_bytes > len(full_bytes_mmap):
+                    raise ValueError(f'{magic} image data is truncated')
+                start = offset + x0 * Z * sample_bytes
+                length = (x1 - x0) * Z * sample_bytes
+                for y in range(y0, y1):
+                    array_1d.frombytes(full_bytes_mmap[start + y * row_bytes : start + y * row_bytes + length])
+                if maxcolors > 255:
+                    array_1d.byteswap()  # Critical for 16 bits per channel
+                elif maxcolors == 1:  # PAM BLACKANDWHITE, forcing conversion to 8 bit L
+                    array_1d = array.array('B', array_1d.tobytes().translate(_PAM_BW_TABLE))
+                    maxcolors = 255
+
+            elif magic == 'P4':
+                # ↓ Only bytes holding region bits unpacked, then cut to region at bit level
+                row_bytes = (X + 7) // 8
+                if offset + Y * row_bytes > len(full_bytes_mmap):
+                    raise ValueError(f'{magic} image data is truncated')
+                first, last, shift = x0 // 8, (x1 + 7) // 8, x0 % 8
+                for y in range(y0, y1):
+                    row_start = offset + y * row_bytes
+                    array_1d.frombytes(_p4_row(full_bytes_mmap[row_start + first : row_start + last], shift + x1 - x0)[shift:])
+
+    if magic in ('P1', 'P2', 'P3'):
+        # ↓ ASCII rows can not be located without reading preceding ones; reading stops after region
+        rows = pnm_iter_rows(in_filename, flat=True)
+        X, Y, Z, maxcolors = next(rows)
+        count = 0
+        for y, row in zip(range(y1), rows):
+            if y >= y0:
+                array_1d.extend(row[x0 * Z : x1 * Z])
+            count += 1
+        rows.close()
+        if count < y1:
+            raise ValueError(f'{magic} image data is truncated')
+
+    image = PNMImage(x1 - x0, y1 - y0, Z, maxcolors, array_1d)
+    del array_1d  # Cleanup
+
+    if flat:
+        return (image.X, image.Y, Z, maxcolors, image)
+    else:
+        return (image.X, image.Y, Z, maxcolors, image2list(image))
+# ↑ End of 'pnm_read_region' function
+
+
+""" ╔══════════════════════════════╗
+    ║ pnm_thumbnail for previews   ║
+    ╚══════════════════════════════╝ """
+
+
+def pnm_thumbnail(in_filename, max_size: int = 256, average: bool = False, flat: bool = False, step: int | None = None) -> tuple[int, int, int, int, list[list[list[int]]] | PNMImage]:
+    """Read PBM, PGM, PPM or PAM file downscaled by integer step, for previews.
+
+    Every ``step``-th pixel of every ``step``-th row is taken, same as
+    Tkinter ``PhotoImage.subsample(step, step)`` does; for binary formats
+    rows in between are not read at all. With ``average`` set ``True``,
+    each pixel is averaged over ``step`` * ``step`` block instead (box filter),
+    which requires reading the whole image, using NumPy if it is installed.
+
+    :param in_filename: input file name;
+    :type in_filename: str | PathLike
+    :param int max_size: maximum thumbnail width and height, used to calculate ``step``;
+    :param bool average: if set ``True``, average blocks instead of taking every ``step``-th pixel;
+    :param bool flat: if set ``True``, return thumbnail as flat ``PNMImage``
+        instead of nested list;
+    :param step: downscale factor, overriding ``max_size`` if given;
+    :type step: int | None
+    :return X, Y, Z, maxcolors, list_3d: tuple, same as for ``pnm2list``,
+        ``X`` and ``Y`` being thumbnail dimensions, that is source ones
+        divided by ``step`` and rounded up.
+
+    """
+
+    with open(in_filename, 'rb') as file:  # Open file for mmap
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as full_bytes_mmap:
+            magic, X, Y, Z, maxcolors, offset = _pnm_header(full_bytes_mmap)
+            promote = magic == 'P7' and maxcolors == 1  # PAM BLACKANDWHITE, forcing conversion to 8 bit L
+            if promote:
+                maxcolors = 255
+            if step is None:
+                step = max(1, -(-max(X, Y) // max_size))  # Rounded up, so thumbnail fits max_size
+            if step < 1:
+                raise ValueError(f'Step {step} must be positive')
+            width, height = -(-X // step), -(-Y // step)
+            datatype = 'B' if maxcolors < 256 else 'H'
+
+            if magic in ('P4', 'P5', 'P6', 'P7') and not average:
+                # ↓ Fixed-size rows, only every step-th one read in place at its offset
+                row_bytes = (X + 7) // 8 if magic == 'P4' else X * Z * (1 if datatype == 'B' else 2)
+                if offset + Y * row_bytes > len(full_bytes_mmap):
+                    raise ValueError(f'{magic} image data is truncated')
+                array_1d = array.array(datatype)
+                for y in range(0, Y, step):
+                    row = full_bytes_mmap[offset + y * row_bytes : offset + (y + 1) * row_bytes]
+                    if magic == 'P4':
+                        array_1d.frombytes(_p4_row(row, X)[::step])
+                        continue
+                    row_array = array.array(datatype)
+                    row_array.frombytes(row.translate(_PAM_BW_TABLE) if promote else row)
+                    # ↓ Taking every step-th pixel by extended slicing channel by channel
+                    thumb_row = array.array(datatype, bytes(width * Z * row_array.itemsize))
+                    for z in range(Z):
+                        thumb_row[z::Z] = row_array[z :: step * Z]
+                    array_1d.extend(thumb_row)
+                if datatype == 'H':
+                    array_1d.byteswap()  # Critical for 16 bits per channel
+
+    if average:
+        array_1d = _thumbnail_average(in_filename, X, Y, Z, maxcolors, step)
+    elif magic in ('P1', 'P2', 'P3'):
+        # ↓ ASCII rows can not be skipped, only decoded and dropped
+        array_1d = array.array(datatype)
+        rows = pnm_iter_rows(in_filename, flat=True)
+        next(rows)
+        for y, row_array in enumerate(rows):
+            if y % step == 0:
+                thumb_row = array.array(datatype, bytes(width * Z * row_array.itemsize))
+                for z in range(Z):
+                    thumb_row[z::Z] = row_array[z :: step * Z]
+                array_1d.extend(thumb_row)
+
+    image = PNMImage(width, height, Z, maxcolors, array_1d)
+    del array_1d  # Cleanup
+
+    if flat:
+        return (width, height, Z, maxcolors, image)
+    else:
+        return (width, height, Z, maxcolors, image2list(image))
+# ↑ End of 'pnm_thumbnail' function
+
+
+def _thumbnail_average(in_filename, X: int, Y: int, Z: int, maxcolors: int, step: int) -> array.array:
+    """Average ``step`` * ``step`` blocks of image for ``pnm_thumbnail``, partial blocks at edges included."""
+
+    datatype = 'B' if maxcolors < 256 else 'H'
+    width = -(-X // step)
+
+    np = _numpy()
+    if np is not None:
+        _, _, _, _, ndarray = pnm2ndarray(in_filename)
+        # ↓ Block sums and pixel counts, edge blocks being smaller
+        accumulator = np.uint32 if step * step * maxcolors < 2**32 else np.uint64
+        sums = np.add.reduceat(np.add.reduceat(ndarray, np.arange(0, Y, step), axis=0, dtype=accumulator), np.arange(0, X, step), axis=1, dtype=accumulator)
+        counts = np.diff(np.append(np.arange(0, Y, step), Y))[:, None, None] * np.diff(np.append(np.arange(0, X, step), X))[None, :, None]
+        return array.array(datatype, ((sums + counts // 2) // counts).astype(np.uint8 if datatype == 'B' else np.uint16).tobytes())
+
+    array_1d = array.array(datatype)
+    counts_x = [min(step, X - x) for x in range(0, X, step)]
+    rows = pnm_iter_rows(in_filename, flat=True)
+    next(rows)
+    for y0 in range(0, Y, step):
+        block_height = min(step, Y - y0)
+        sums = [[0] * width for z in range(Z)]
+        for row in (next(rows) for y in range(block_height)):
+            for dx in range(min(step, X)):
+                for z in range(Z):
+                    part = row[dx * Z + z :: step * Z]
+                    sums[z][0 : len(part)] = map(int.__add__, sums[z], part)
+        thumb_row = array.array(datatype, bytes(width * Z * array_1d.itemsize))
+        for z in range(Z):
+            thumb_row[z::Z] = array.array(datatype, [(total + count * block_height // 2) // (count * block_height) for total, count in zip(sums[z], counts_x)])
+        array_1d.extend(thumb_row)
+    rows.close()
+
+    return array_1d
+# ↑ End of '_thumbnail_average' function
+
+
+""" ╔══════════════════════════════╗
+    ║  Multi-image streams: frames ║
+    ╚══════════════════════════════╝ """
+
+# ↓ ASCII raster sample and comment patterns, used to find where ASCII image ends and next begins
+_P1_TOKEN = re.compile(rb'#[^\r\n]*|[01]')
+_P32_TOKEN = re.compile(rb'#[^\r\n]*|\d+')
+_BETWEEN_FRAMES = re.compile(rb'(?:\s|#[^\r\n]*[\r\n])*')
+
+
+class _StreamBuffer:
+    """Read-ahead buffer over binary stream, keeping data not consumed yet for next image."""
+
+    def __init__(self, stream, chunk_size: int = 1048576) -> None:
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.data = bytearray()
+        self.eof = False
+
+    def more(self, size: int = 0) -> bool:
+        """Read next chunk, up to ``size`` bytes if given; return ``False`` at end of stream.
+
+        Buffered streams are read with ``read1``, returning whatever is available,
+        so that pipe kept open by writer does not block until whole chunk arrives.
+        With ``size`` given, nothing beyond it is requested, so that binary image
+        is complete as soon as its last byte arrives.
+
+        """
+
+        chunk = (self.stream.read1 if hasattr(self.stream, 'read1') else self.stream.read)(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.data += chunk
+        return True
+
+    def fill(self, size: int) -> bool:
+        """Read until ``size`` bytes are buffered, requesting exactly missing length; return ``False`` if stream ends before."""
+
+        while len(self.data) < size and self.more(size - len(self.data)):
+            pass
+        return len(self.data) >= size
+
+    def consume(self, size: int) -> bytes:
+        """Remove first ``size`` bytes from buffer and return them."""
+
+        data = bytes(self.data[0:size])
+        del self.data[0:size]
+        return data
+# ↑ End of '_StreamBuffer' class
+
+
+def _read_frame(stream_buffer: _StreamBuffer) -> tuple[str, int, int, int, int, int, bytes] | None:
+    """Read next image from ``stream_buffer``, return ``None`` at the end of stream.
+
+    :return magic, X, Y, Z, maxcolors, offset, frame: header values as returned
+        by ``_pnm_header``, and ``frame`` bytes, holding header and image data.
+
+    """
+
+    # ↓ Skipping whitespace, allowed between ASCII images, and comments ending previous image data
+    while True:
+        data = stream_buffer.data
+        del data[0 : _BETWEEN_FRAMES.match(data).end()]
+        if (data and not data.startswith(b'#')) or not stream_buffer.more():
+            break
+    if not stream_buffer.data or stream_buffer.data.startswith(b'#'):
+        return None
+
+    # ↓ Reading until header is complete; header is short, so reading is limited
+    while True:
+        stream_buffer.fill(2)
+        magic = bytes(stream_buffer.data[0:2])
+        if magic not in (b'P1', b'P2', b'P3', b'P4', b'P5', b'P6', b'P7'):
+            raise ValueError(f'Header {magic} is not in P1:P7 range')
+        try:
+            magic, X, Y, Z, maxcolors, offset = _pnm_header(stream_buffer.data)
+            break
+        except ValueError:
+            if len(stream_buffer.data) > 65536 or not stream_buffer.more():
+                raise
+
+    if magic in ('P1', 'P2', 'P3'):
+        # ↓ Counting ASCII samples, token cut by end of buffer being completed with next read
+        pattern = _P1_TOKEN if magic == 'P1' else _P32_TOKEN
+        needed = X * Y if magic == 'P1' else X * Y * Z
+        count = 0
+        position = offset
+        while count < needed:
+            tokens = pattern.finditer(stream_buffer.data, position)
+            for token in tokens:
+                if token.end() == len(stream_buffer.data) and not stream_buffer.eof and (magic != 'P1' or token.group().startswith(b'#')):
+                    break  # Token may continue in next chunk, except P1 one digit sample
+                position = token.end()
+                if token.group().startswith(b'#'):  # Comment skipped
+                    continue
+                count += 1
+                if count == needed:
+                    break
+            del tokens  # Releasing buffer before it grows
+            if count < needed:
+                if stream_buffer.eof:
+                    raise ValueError(f'{magic} image data is truncated')
+                stream_buffer.more()
+        length = position
+    else:
+        # ↓ Binary image data length is known from header
+        if magic == 'P4':
+            length = offset + ((X + 7) // 8) * Y
+        else:
+            length = offset + X * Y * Z * (1 if maxcolors < 256 else 2)
+        if not stream_buffer.fill(length):
+            raise ValueError(f'{magic} image data is truncated')
+
+    return (magic, X, Y, Z, maxcolors, offset, stream_buffer.consume(length))
+# ↑ End of '_read_frame' function
+
+
+def pnm_frames(source, flat: bool = False) -> Iterator[tuple[int, int, int, int, list[list[list[int]]] | PNMImage]]:
+    """Read consecutive images of multi-image PNM file or stream, one by one.
+
+    Netpbm allows several images, not necessarily of the same type or size,
+    to be concatenated in one file or pipe, like ``ffmpeg -f image2pipe -vcodec ppm`` output.
+    Only one image is kept in memory at a time::
+
+        for X, Y, Z, maxcolors, list_3d in pnm_frames(in_filename):
+            ...
+
+    :param source: input file name, or binary file-like object with ``read()``,
+        like ``sys.stdin.buffer`` or ``subprocess.Popen.stdout``,
+        or multi-image data in memory as bytes-like object;
+        buffered stream with ``read1()`` yields each image as soon as it arrives;
+    :param bool flat: if set ``True``, yield images as flat ``PNMImage``
+        instead of nested list;
+    :return: generator, yielding ``(X, Y, Z, maxcolors, list_3d)`` tuple
+        per image, same as ``pnm2list`` returns.
+
+    """
+
+    if isinstance(source, (str, PathLike)):
+        with open(source, 'rb') as file:
+            yield from pnm_frames(file, flat)
+        return
+    if not hasattr(source, 'read'):  # Bytes-like object
+        source = BytesIO(source)
+
+    stream_buffer = _StreamBuffer(source)
+    while (frame := _read_frame(stream_buffer)) is not None:
+        magic, X, Y, Z, maxcolors, offset, frame_bytes = frame
+        maxcolors, array_1d = _decode_raster(frame_bytes, magic, X, Y, Z, maxcolors, offset)
+        del frame_bytes  # Cleanup
+
+        image = PNMImage(X, Y, Z, maxcolors, array_1d)
+        yield (X, Y, Z, maxcolors, image if flat else image2list(image))
+# ↑ End of 'pnm_frames' generator
+
+
+def frames2pnm(out_filename, frames, bin: bool = True, pam: bool = False, append: bool = False) -> None:
+    """Write several images to one multi-image PNM file, one after another.
+
+    :param out_filename: name of the PNM file to be written,
+        or writable binary file-like object, like ``sys.stdout.buffer`` pipe;
+    :type out_filename: str | PathLike | BinaryIO
+    :param frames: iterable of ``(X, Y, Z, maxcolors, list_3d)`` tuples,
+        like ``pnm_frames`` output, ``list_3d`` being nested list or ``PNMImage``;
+    :param bool bin: whether images will be binary or ASCII;
+    :param bool pam: whether images will be PAM, keeping alpha;
+    :param bool append: if set ``True``, add images to the end of existing file.
+    :return: None
+
+    """
+
+    for n, (X, Y, Z, maxcolors, list_3d) in enumerate(frames):
+        # ↓ First image creates file unless appending, the rest are appended
+        with PNMWriter(out_filename, X, Y, Z, maxcolors, bin=bin, pam=pam, append=append or n > 0) as writer:
+            for y in range(Y):
+                writer.write_row(list_3d.row(y) if isinstance(list_3d, PNMImage) else list_3d[y])
+
+    return None
+# ↑ End of 'frames2pnm' function
+
+
+def _numpy():
+    """Return NumPy module if installed, otherwise ``None``.
+
+    NumPy is optional; imported upon first use only, not upon importing PyPNM.
+
+    """
+
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+# ↑ End of '_numpy' optional import function
+
+
+def _chessboard(content, X: int, Y: int, Z: int, Z_READ: int, maxcolors: int, chess_size: int | None = None, chess_colors: tuple | None = None) -> array.array:
+    """Mix flat image data with alpha against chessboard, dropping alpha.
+
+    Chessboard background is built once as one row pattern per tile row parity,
+    then each channel of each row is mixed as a whole, using NumPy if available.
+    Default size and colors match Photoshop 7.0 "Light" chessboard.
+
+    Photoshop chess pattern preset parameters:
+    - Small: 4 px | Medium: 8 px | Large: 16 px;
+    - Light: (0.8, 1.0) | Medium: (0.4, 0.6) | Dark: (0.2, 0.4) of ``maxcolors``.
+
+    :param content: flat image data, ``Z`` channels per pixel;
+    :type content: bytearray | array.array
+    :param int X, Y, Z: image dimensions;
+    :param int Z_READ: number of color channels, alpha being channel ``Z_READ``;
+    :param int maxcolors: number of colors per channel;
+    :param chess_size: tile size in pixels;
+    :type chess_size: int | None
+    :param chess_colors: pair of tile colors, each int or tuple of ints per channel;
+    :type chess_colors: tuple | None
+    :return: flat image data, ``Z_READ`` channels per pixel.
+    :rtype: array.array
+
+    """
+
+    if chess_size is None:
+        if X < 65 or Y < 65:
+            chess_size = 4
+        elif X > 512 or Y > 512:
+            chess_size = 16
+        else:
+            chess_size = 8
+    if chess_size < 1:
+        raise ValueError(f'Chessboard size {chess_size} must be positive')
+
+    if chess_colors is None:
+        chess_colors = (int(maxcolors * 0.8), maxcolors)
+    # ↓ Each tile color expanded to tuple of Z_READ channels
+    colors = tuple((color,) * Z_READ if isinstance(color, int) else tuple(color)[:Z_READ] for color in chess_colors)
+    if len(colors) != 2 or any(len(color) != Z_READ for color in colors):
+        raise ValueError(f'Chessboard colors {chess_colors} must be pair of ints or of {Z_READ}-tuples')
+
+    datatype = 'B' if maxcolors < 256 else 'H'
+
+    np = _numpy()
+    if np is not None:
+        # ↓ uint32 is enough since c * a + b * (maxcolors - a) <= maxcolors ** 2
+        image = np.frombuffer(content, dtype=np.uint8 if datatype == 'B' else np.uint16).reshape(Y, X, Z).astype(np.uint32)
+        alpha = image[:, :, Z_READ:Z_READ + 1]
+        even = ((np.arange(Y) // chess_size) % 2)[:, None] == ((np.arange(X) // chess_size) % 2)[None, :]
+        background = np.where(even[:, :, None], np.array(colors[0], dtype=np.uint32), np.array(colors[1], dtype=np.uint32))
+        mixed = (image[:, :, :Z_READ] * alpha + background * (maxcolors - alpha)) // maxcolors
+        return array.array(datatype, mixed.astype(np.uint8 if datatype == 'B' else np.uint16).tobytes())
+
+    # ↓ Background row patterns per channel, for even and odd tile rows
+    patterns = tuple(tuple([colors[((x // chess_size) % 2) != parity][z] for x in range(X)] for z in range(Z_READ)) for parity in (0, 1))
+
+    row_length = X * Z
+    row_read = X * Z_READ
+    content_read = array.array(datatype, bytes(X * Y * Z_READ * (1 if datatype == 'B' else 2)))
+    for y in range(Y):
+        row = content[y * row_length:(y + 1) * row_length]
+        alphas = row[Z_READ::Z]
+        pattern = patterns[(y // chess_size) % 2]
+        for z in range(Z_READ):
+            content_read[y * row_read + z:(y + 1) * row_read:Z_READ] = array.array(datatype, [(c * a + b * (maxcolors - a)) // maxcolors for c, a, b in zip(row[z::Z], alphas, pattern[z])])
+
+    return content_read
+# ↑ End of '_chessboard' chessboard mixing function
 
 
 """ ╔══════════╗
     ║ list2bin ║
     ╚══════════╝ """
 
-def list2bin(list_3d: list[list[list[int]]], maxcolors: int, show_chessboard: bool = False) -> bytes:
+def list2bin(list_3d: list[list[list[int]]] | PNMImage, maxcolors: int, show_chessboard: bool = False, chess_size: int | None = None, chess_colors: tuple | None = None) -> bytes:
     """Convert nested image data list to PGM P5 or PPM P6 bytes in memory.
 
     :param list_3d: image as list (image) of lists (rows) of lists (pixels)
-        of ints (channels);
-    :type list_3d: list[list[list[int]]]
+        of ints (channels), or flat ``PNMImage``;
+    :type list_3d: list[list[list[int]]] | PNMImage
     :param int maxcolors: number of colors per channel for current image,
         either 255, or 65535;
     :param bool show_chessboard: if set ``True`` and alpha channel exist,
         render preview against chessboard, otherwise skip alpha;
+    :param chess_size: chessboard tile size in pixels,
+        default ``None`` means Photoshop-like 4, 8 or 16 px depending on image size;
+    :type chess_size: int | None
+    :param chess_colors: pair of chessboard tile colors, each either int, or tuple
+        of ints per channel, default ``None`` means (0.8, 1.0) of ``maxcolors``;
+    :type chess_colors: tuple | None
     :return: PNM-like object in memory.
     :rtype: bytes
 
     """
 
     # ↓ Image X, Y, Z sizes
-    Y, X, Z = (len(list_3d), len(list_3d[0]), len(list_3d[0][0]))
-
-    def _chess(x: int, y: int) -> int:
-        """Chessboard pattern, size and color match Photoshop 7.0.
-
-        Photoshop chess pattern preset parameters:
-        - Small: 4 px | Medium: 8 px | Large: 16 px;
-        - Light: (0.8, 1.0) | Medium: (0.4, 0.6) | Dark: (0.2, 0.4) of ``maxcolors``.
-
-        """
-
-        if X < 65 or Y < 65:
-            chess_size = 4
-        elif X > 512 or Y > 512:
-            chess_size = 16
-        else:
-            chess_size = 8
-        return int(maxcolors * 0.8) if ((y // chess_size) % 2) == ((x // chess_size) % 2) else maxcolors
+    if isinstance(list_3d, PNMImage):
+        X, Y, Z = list_3d.X, list_3d.Y, list_3d.Z
+    else:
+        Y, X, Z = (len(list_3d), len(list_3d[0]), len(list_3d[0][0]))
 
     magic = 'P5' if Z < 3 else 'P6'  # PGM or PPM
 
     if Z == 3 or Z == 1:  # Source has no alpha
         Z_READ = Z  # Number of color channels
-        # ↓ Generator: Flattening 3D list to 1D list
-        list_1d = (list_3d[y][x][z] for y in range(Y) for x in range(X) for z in range(Z_READ))
     else:  # Source has alpha
         Z_READ = min(Z, 4) - 1  # Number of color channels without alpha; clipping anything above RGB off
 
-        if show_chessboard:
-            # ↓ Generator: Flattening 3D list to 1D list, mixing with chessboard
-            list_1d = ((((list_3d[y][x][z] * list_3d[y][x][Z_READ]) + (_chess(x, y) * (maxcolors - list_3d[y][x][Z_READ]))) // maxcolors) for y in range(Y) for x in range(X) for z in range(Z_READ))
-        else:
-            # ↓ Generator: Flattening 3D list to 1D list, skipping alpha
-            list_1d = (list_3d[y][x][z] for y in range(Y) for x in range(X) for z in range(Z_READ))
-
-    if maxcolors < 256:
-        content = array.array('B', list_1d)  # Bytes
+    datatype = 'B' if maxcolors < 256 else 'H'
+    start = perf_counter() if _STAGE_HOOKS else None
+
+    if isinstance(list_3d, PNMImage):
+        # ↓ Flat data used as is, no flattening needed
+        content = list_3d.data if list_3d.data.typecode == datatype else array.array(datatype, list_3d.data)
+    elif datatype == 'B':
+        # ↓ Flattening 3D list row by row in C, chaining pixels of each row
+        content = bytearray()
+        for row in list_3d:
+            content.extend(chain.from_iterable(row))
     else:
-        content = array.array('H', list_1d)  # Doubles
+        content = array.array(datatype)
+        for row in list_3d:
+            content.fromlist(list(chain.from_iterable(row)))
+    if start is not None:
+        start = _stage('list2bin', 'flatten', start, 0, X * Y * Z)
+
+    if Z_READ < Z and show_chessboard:
+        # ↓ Mixing with chessboard, whole rows at once
+        content = _chessboard(content, X, Y, Z, Z_READ, maxcolors, chess_size, chess_colors)
+    elif Z_READ < Z:
+        # ↓ Skipping alpha by extended slicing channel by channel
+        content_read = bytearray(X * Y * Z_READ) if datatype == 'B' else array.array(datatype, bytes(X * Y * Z_READ * 2))
+        for z in range(Z_READ):
+            content_read[z::Z_READ] = content[z::Z]
+        content = content_read
+    elif datatype == 'H' and isinstance(list_3d, PNMImage) and content is list_3d.data:
+        content = content[:]  # Copy to byteswap, leaving source image intact
+
+    if datatype == 'H':
         content.byteswap()  # Critical for 16 bits per channel
-
-    return b''.join((f'{magic}\n{X} {Y}\n{maxcolors}\n'.encode('ascii'), content.tobytes()))
+    if start is not None:
+        start = _stage('list2bin', 'alpha and byteswap', start, 0, X * Y * Z_READ)
+
+    # ↓ Header and content joined by one copy, without intermediate bytes
+    pnm_bytes = b''.join((f'{magic}\n{X} {Y}\n{maxcolors}\n'.encode('ascii'), content))
+    if start is not None:
+        _stage('list2bin', 'join', start, len(pnm_bytes))
+    return pnm_bytes
 # ↑ End of 'list2bin' list to in-memory PNM conversion function
 
 
+""" ╔═══════════╗
+    ║ PNMWriter ║
+    ╚═══════════╝ """
+
+# ↓ 8 bit sample to ASCII decimal string lookup table
+_STR_TABLE = tuple(map(str, range(256)))
+
+
+class PNMWriter:
+    """Write PNM file row by row, without keeping whole image in memory.
+
+    Binary PGM (P5) or PPM (P6) is written if ``bin`` is ``True``,
+    otherwise ASCII PGM (P2) or PPM (P3). Alpha channel, if any, is skipped,
+    same as in ``list2pnmbin`` and ``list2pnmascii``.
+    If ``pam`` is ``True``, PAM (P7) is written instead, keeping all channels.
+    Use as context manager; upon closing writer checks that exactly ``Y`` rows were written::
+
+        with PNMWriter(out_filename, X, Y, Z, maxcolors) as writer:
+            for row in rows:
+                writer.write_row(row)
+
+    :param out_filename: name of the PNM file to be written,
+        or writable binary file-like object, like ``sys.stdout.buffer`` pipe,
+        which is left open upon closing writer;
+    :type out_filename: str | PathLike | BinaryIO
+    :param int X, Y, Z: image dimensions;
+    :param int maxcolors: number of colors per channel for current image,
+        either 255, or 65535;
+    :param bool bin: whether written file will be binary or ASCII;
+    :param bool pam: whether written file will be PAM, always binary;
+    :param bool append: if set ``True``, image is added to the end of existing file,
+        making multi-image file, readable with ``pnm_frames``.
+
+    """
+
+    def __init__(self, out_filename, X: int, Y: int, Z: int, maxcolors: int, bin: bool = True, pam: bool = False, append: bool = False) -> None:
+        self.X = X
+        self.Y = Y
+        self.Z = Z
+        self.maxcolors = maxcolors
+        self.bin = bin or pam
+        self.rows_written = 0
+
+        if pam:
+            tupltype = {1: 'TUPLTYPE GRAYSCALE\n', 2: 'TUPLTYPE GRAYSCALE_ALPHA\n', 3: 'TUPLTYPE RGB\n', 4: 'TUPLTYPE RGB_ALPHA\n'}.get(Z, '')
+            self._Z_READ = Z  # PAM keeps all channels
+            header = f'P7\nWIDTH {X}\nHEIGHT {Y}\nDEPTH {Z}\nMAXVAL {maxcolors}\n{tupltype}ENDHDR\n'
+        elif bin:
+            magic = 'P5' if Z < 3 else 'P6'  # PGM or PPM
+            self._Z_READ = Z if Z == 3 or Z == 1 else min(Z, 4) - 1  # To skip alpha later; clipping anything above RGB off
+            header = f'{magic}\n{X} {Y}\n{maxcolors}\n'
+        else:
+            magic = 'P2' if Z < 3 else 'P3'  # PGM or PPM
+            self._Z_READ = 1 if Z < 3 else 3
+            header = f'{magic}\n{X} {Y}\n{maxcolors}\n'
+            # ↓ Whole pixels per line, as many as fit specs line <= 70 char
+            self._line_samples = max(1, (70 // (len(str(maxcolors)) + 1)) // self._Z_READ) * self._Z_READ
+            self._pending = []  # Formatted rows, written in large chunks
+            self._pending_size = 0
+        self._datatype = 'B' if maxcolors < 256 else 'H'
+        # ↓ Stage times and bytes written, summed up over rows and reported upon closing, if hooks are registered
+        self._stages = {} if _STAGE_HOOKS else None
+        self._bytes_written = 0
+
+        # ↓ Stream given is written to as is, file name is opened; ASCII is written as bytes too
+        self._own_file = not hasattr(out_filename, 'write')
+        self._file = open(out_filename, 'ab' if append else 'wb') if self._own_file else out_filename
+        self._file.write(header.encode('ascii'))  # Writing PNM header to file
+
+    def __enter__(self) -> 'PNMWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        elif self._own_file:
+            self._flush_pending()  # Keeping rows written so far, same as binary
+            self._file.close()  # Not masking original exception with row count check
+
+    def write_row(self, row) -> None:
+        """Write one image row.
+
+        :param row: either list (row) of lists (pixels) of ints (channels),
+            or flat sequence of X * Z ints, like ``array``, or ``PNMImage.row()``.
+
+        """
+
+        if self.rows_written >= self.Y:
+            raise ValueError(f'Attempt to write row beyond {self.Y} rows')
+        start = perf_counter() if self._stages is not None else None
+
+        X, Z, Z_READ = self.X, self.Z, self._Z_READ
+        if isinstance(row[0], int):  # Flat row
+            if len(row) != X * Z:
+                raise ValueError(f'Row length {len(row)} does not match {X} * {Z}')
+            if Z_READ == Z and isinstance(row, (array.array, memoryview)) and memoryview(row).format == self._datatype and memoryview(row).contiguous:
+                row_array = array.array(self._datatype)
+                row_array.frombytes(memoryview(row).cast('B'))  # Same type buffer, like ``PNMImage.row()``, copied at once
+            elif Z_READ == Z:
+                row_array = array.array(self._datatype, row)
+            else:
+                # ↓ Skipping channels above Z_READ by extended slicing channel by channel
+                row_array = array.array(self._datatype, bytes(X * Z_READ * array.array(self._datatype).itemsize))
+                for z in range(Z_READ):
+                    row_array[z::Z_READ] = array.array(self._datatype, row[z::Z])
+        else:  # Row of pixels
+            if len(row) != X:
+                raise ValueError(f'Row length {len(row)} does not match {X}')
+            # ↓ Flattening one row in C, chaining pixels, cut to Z_READ channels if necessary
+            row_array = array.array(self._datatype, chain.from_iterable(row if Z_READ == Z else (pixel[0:Z_READ] for pixel in row)))
+        if start is not None:
+            start = self._stage_add('convert', start)
+
+        if self.bin:
+            if self.maxcolors > 255:
+                row_array.byteswap()  # Critical for 16 bits per channel
+            self._file.write(row_array)  # Writing row bytes array to file
+            if start is not None:
+                self._stage_add('write', start)
+                self._bytes_written += len(row_array) * row_array.itemsize
+        else:
+            # ↓ Formatting whole row at once, row starting new line, lines holding whole number of samples
+            samples = list(map(_STR_TABLE.__getitem__, row_array) if self._datatype == 'B' else map(str, row_array))
+            step = self._line_samples
+            row_str = '\n'.join([' '.join(samples[i : i + step]) for i in range(0, len(samples), step)]) + '\n'
+            self._pending.append(row_str)
+            self._pending_size += len(row_str)
+            if start is not None:
+                self._stage_add('format', start)
+            if self._pending_size >= 1048576:
+                self._flush_pending()
+
+        self.rows_written += 1
+
+    def write_rows(self, rows) -> None:
+        """Write several image rows from any iterable, like ``pnm_iter_rows`` output."""
+
+        for row in rows:
+            self.write_row(row)
+
+    def _flush_pending(self) -> None:
+        """Write formatted ASCII rows, accumulated so far, to file at once."""
+
+        if not self.bin and self._pending:
+            start = perf_counter() if self._stages is not None else None
+            self._file.write(''.join(self._pending).encode('ascii'))
+            if start is not None:
+                self._stage_add('write', start)
+                self._bytes_written += self._pending_size
+            self._pending = []
+            self._pending_size = 0
+
+    def _stage_add(self, stage: str, start: float) -> float:
+        """Add time since ``start`` to ``stage`` total; return current time."""
+
+        now = perf_counter()
+        self._stages[stage] = self._stages.get(stage, 0.0) + now - start
+        return now
+
+    def _write_encoded(self, encoded: bytes, rows: int) -> None:
+        """Write ``rows`` rows, already encoded by another writer with the same settings."""
+
+        if self.rows_written + rows > self.Y:
+            raise ValueError(f'Attempt to write row beyond {self.Y} rows')
+        self._flush_pending()
+        self._file.write(encoded)
+        self.rows_written += rows
+
+    def close(self) -> None:
+        """Close file, or flush stream, checking that exactly ``Y`` rows were written."""
+
+        self._flush_pending()
+        if self._own_file:
+            self._file.close()
+        else:
+            self._file.flush()
+        if self.rows_written != self.Y:
+            raise ValueError(f'{self.rows_written} rows written instead of {self.Y}')
+
+        if self._stages is not None:
+            samples = self.rows_written * self.X * self._Z_READ
+            for stage, seconds in self._stages.items():
+                for hook in _STAGE_HOOKS:
+                    hook('PNMWriter', stage, seconds, self._bytes_written if stage == 'write' else 0, samples)
+# ↑ End of 'PNMWriter' class
+
+
 """ ╔═════════════╗
     ║ list2pnmbin ║
     ╚═════════════╝ """
 
-def list2pnmbin(out_filename: str, list_3d: list[list[list[int]]], maxcolors: int) -> None:
+def list2pnmbin(out_filename, list_3d: list[list[list[int]]] | PNMImage, maxcolors: int) -> None:
     """Write binary PNM ``out_filename`` file; writing performed per row to reduce RAM usage.
 
-    :param str out_filename: name of the PNM file to be written;
+    :param out_filename: name of the PNM file to be written,
+        or writable binary file-like object;
+    :type out_filename: str | PathLike | BinaryIO
     :param list_3d: image as list (image) of lists (rows) of lists (pixels)
-        of ints (channels);
-    :type list_3d: list[list[list[int]]]
+        of ints (channels), or flat ``PNMImage``;
+    :type list_3d: list[list[list[int]]] | PNMImage
     :param int maxcolors: number of colors per channel for current image,
         either 255, or 65535.
     :return: None
@@ -441,21 +1835,14 @@ def list2pnmbin(out_filename: str, list_3d: list[list[list[int]]], maxcolors: in
     """
 
     # ↓ Image X, Y, Z sizes
-    Y, X, Z = (len(list_3d), len(list_3d[0]), len(list_3d[0][0]))
-
-    magic = 'P5' if Z < 3 else 'P6'  # PGM or PPM
-    Z_READ = Z if Z == 3 or Z == 1 else min(Z, 4) - 1  # To skip alpha later; clipping anything above RGB off
-    datatype = 'B' if maxcolors < 256 else 'H'
+    if isinstance(list_3d, PNMImage):
+        X, Y, Z = list_3d.X, list_3d.Y, list_3d.Z
+    else:
+        Y, X, Z = (len(list_3d), len(list_3d[0]), len(list_3d[0][0]))
 
-    with open(out_filename, 'wb') as file_pnm:
-        file_pnm.write(f'{magic}\n{X} {Y}\n{maxcolors}\n'.encode('ascii'))  # Writing PNM header to file
+    with PNMWriter(out_filename, X, Y, Z, maxcolors, bin=True) as writer:
         for y in range(Y):
-            # ↓ Generator: Flattening one row
-            row_1d = (list_3d[y][x][z] for x in range(X) for z in range(Z_READ))
-            row_array = array.array(datatype, row_1d)  # list[int] to array
-            if maxcolors > 255:
-                row_array.byteswap()  # Critical for 16 bits per channel
-            file_pnm.write(row_array)  # Writing row bytes array to file
+            writer.write_row(list_3d.row(y) if isinstance(list_3d, PNMImage) else list_3d[y])
 
     return None
 # ↑ End of 'list2pnmbin' function writing binary PPM/PGM file
@@ -465,13 +1852,15 @@ def list2pnmbin(out_filename: str, list_3d: list[list[list[int]]], maxcolors: in
     ║ list2pnmascii ║
     ╚═══════════════╝ """
 
-def list2pnmascii(out_filename: str, list_3d: list[list[list[int]]], maxcolors: int) -> None:
-    """Write ASCII PNM ``out_filename`` file; writing performed per sample to reduce RAM usage.
+def list2pnmascii(out_filename, list_3d: list[list[list[int]]] | PNMImage, maxcolors: int) -> None:
+    """Write ASCII PNM ``out_filename`` file; writing performed per row, flushed in large chunks, to reduce RAM usage.
 
-    :param str out_filename: name of the PNM file to be written;
+    :param out_filename: name of the PNM file to be written,
+        or writable binary file-like object;
+    :type out_filename: str | PathLike | BinaryIO
     :param list_3d: image as list (image) of lists (rows) of lists (pixels)
-        of ints (channels);
-    :type list_3d: list[list[list[int]]]
+        of ints (channels), or flat ``PNMImage``;
+    :type list_3d: list[list[list[int]]] | PNMImage
     :param int maxcolors: number of colors per channel for current image,
         either 255, or 65535.
     :return: None
@@ -479,49 +1868,83 @@ def list2pnmascii(out_filename: str, list_3d: list[list[list[int]]], maxcolors:
     """
 
     # ↓ Image X, Y, Z sizes
-    Y, X, Z = (len(list_3d), len(list_3d[0]), len(list_3d[0][0]))
-
-    if Z < 3:  # L or LA image
-        magic = 'P2'
-        Z_READ = 1
-    else:  # RGB or RGBA image
-        magic = 'P3'
-        Z_READ = 3
+    if isinstance(list_3d, PNMImage):
+        X, Y, Z = list_3d.X, list_3d.Y, list_3d.Z
+    else:
+        Y, X, Z = (len(list_3d), len(list_3d[0]), len(list_3d[0][0]))
 
-    with open(out_filename, 'w') as file_pnm:
-        file_pnm.write(f'{magic}\n{X} {Y}\n{maxcolors}\n')  # Writing PNM header to file
-        sample_count = 0  # Start counting samples to break line <= 60 char
+    with PNMWriter(out_filename, X, Y, Z, maxcolors, bin=False) as writer:
         for y in range(Y):
-            for x in range(X):
-                for z in range(Z_READ):
-                    sample_count += 1
-                    if (sample_count % 3) == 0:  # 3 must fit any specs for line length
-                        file_pnm.write('\n')  # Writing break to fulfill specs line <= 60 char
-                    file_pnm.write(f'{list_3d[y][x][z]} ')  # Writing channel value to file
+            writer.write_row(list_3d.row(y) if isinstance(list_3d, PNMImage) else list_3d[y])
 
     return None
 # ↑ End of 'list2pnmascii' function writing ASCII PPM/PGM file
 
 
+""" ╔══════════╗
+    ║ list2pam ║
+    ╚══════════╝ """
+
+def list2pam(out_filename, list_3d: list[list[list[int]]] | PNMImage, maxcolors: int) -> None:
+    """Write PAM ``out_filename`` file, keeping all channels, alpha included; writing performed per row to reduce RAM usage.
+
+    :param out_filename: name of the PAM file to be written,
+        or writable binary file-like object;
+    :type out_filename: str | PathLike | BinaryIO
+    :param list_3d: image as list (image) of lists (rows) of lists (pixels)
+        of ints (channels), or flat ``PNMImage``;
+    :type list_3d: list[list[list[int]]] | PNMImage
+    :param int maxcolors: number of colors per channel for current image,
+        either 255, or 65535.
+    :return: None
+
+    """
+
+    # ↓ Image X, Y, Z sizes
+    if isinstance(list_3d, PNMImage):
+        X, Y, Z = list_3d.X, list_3d.Y, list_3d.Z
+    else:
+        Y, X, Z = (len(list_3d), len(list_3d[0]), len(list_3d[0][0]))
+
+    with PNMWriter(out_filename, X, Y, Z, maxcolors, pam=True) as writer:
+        for y in range(Y):
+            writer.write_row(list_3d.row(y) if isinstance(list_3d, PNMImage) else list_3d[y])
+
+    return None
+# ↑ End of 'list2pam' function writing PAM file
+
+
 """ ╔══════════╗
     ║ list2pnm ║
     ╚══════════╝ """
 
-def list2pnm(out_filename: str, list_3d: list[list[list[int]]], maxcolors: int, bin: bool = True) -> None:
-    """Write PNM file using either ``list2pnmbin`` or ``list2pnmascii`` depending on ``bin`` switch.
+def list2pnm(out_filename, list_3d: list[list[list[int]]] | PNMImage, maxcolors: int, bin: bool = True, pam: bool = False, workers: int | None = None) -> None:
+    """Write PNM file using either ``list2pnmbin`` or ``list2pnmascii`` depending on ``bin`` switch, or ``list2pam`` if ``pam`` is ``True``.
 
-    :param str out_filename: name of the PNM file to be written;
+    :param out_filename: name of the PNM file to be written,
+        or writable binary file-like object;
+    :type out_filename: str | PathLike | BinaryIO
     :param list_3d: image as list (image) of lists (rows) of lists (pixels)
-        of ints (channels);
-    :type list_3d: list[list[list[int]]]
+        of ints (channels), or flat ``PNMImage``;
+    :type list_3d: list[list[list[int]]] | PNMImage
     :param int maxcolors: number of colors per channel for current image,
         either 255, or 65535;
-    :param bool bin: whether written file will be binary or ASCII.
+    :param bool bin: whether written file will be binary or ASCII;
+    :param bool pam: whether written file will be PAM, keeping alpha;
+    :param workers: if set above 1, ASCII image is split to bands of rows,
+        formatted by that many processes, and written in original order;
+        binary and PAM images are always encoded in current process;
+        default ``None`` means encoding in current process;
+    :type workers: int | None
     :return: None
 
     """
 
-    if bin:
+    if workers is not None and workers > 1 and not (bin or pam):
+        _list2pnm_parallel(out_filename, list_3d, maxcolors, workers)
+    elif pam:
+        list2pam(out_filename, list_3d, maxcolors)
+    elif bin:
         list2pnmbin(out_filename, list_3d, maxcolors)
     else:
         list2pnmascii(out_filename, list_3d, maxcolors)
@@ -530,12 +1953,270 @@ def list2pnm(out_filename: str, list_3d: list[list[list[int]]], maxcolors: int,
 # ↑ End of 'list2pnm' switch function writing any type of PPM/PGM file
 
 
+def _encode_ascii_band(X: int, Y: int, Z: int, maxcolors: int, data: array.array) -> bytes:
+    """Format flat band of ``Y`` rows to ASCII PNM raster bytes, without header, in worker process."""
+
+    buffer = BytesIO()
+    with PNMWriter(buffer, X, Y, Z, maxcolors, bin=False) as writer:
+        header_end = buffer.tell()
+        row_length = X * Z
+        for y in range(Y):
+            writer.write_row(data[y * row_length : (y + 1) * row_length])
+
+    return buffer.getvalue()[header_end:]
+# ↑ End of '_encode_ascii_band' function
+
+
+def _list2pnm_parallel(out_filename, list_3d: list[list[list[int]]] | PNMImage, maxcolors: int, workers: int) -> None:
+    """Write ASCII PNM file like ``list2pnmascii``, splitting formatting of row bands between ``workers`` processes.
+
+    Nested list is flattened once, in current process, so that only flat arrays
+    are passed to workers, and only formatted bytes are passed back.
+
+    """
+
+    image = list_3d if isinstance(list_3d, PNMImage) else list2image(list_3d, maxcolors)
+    X, Y, Z = image.X, image.Y, image.Z
+
+    band_Y = -(-Y // workers)  # Rounded up, so there are no more bands than workers
+    starts = range(0, Y, band_Y)
+    bands = (image.data[y * X * Z : (y + band_Y) * X * Z] for y in starts)
+
+    with PNMWriter(out_filename, X, Y, Z, maxcolors, bin=False) as writer:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # ↓ Bands are returned in original order, and written as soon as ready
+            for y, encoded in zip(starts, pool.map(_encode_ascii_band, repeat(X), (min(band_Y, Y - y) for y in starts), repeat(Z), repeat(maxcolors), bands)):
+                writer._write_encoded(encoded, min(band_Y, Y - y))
+
+    return None
+# ↑ End of '_list2pnm_parallel' function
+
+
+""" ╔══════════╗
+    ║ list2pbm ║
+    ╚══════════╝ """
+
+def list2pbm(out_filename, list_3d: list[list[list[int]]] | PNMImage, maxcolors: int, bin: bool = True, threshold: int | None = None, dither: bool = False) -> None:
+    """Write 1 bit ink on/off PBM ``out_filename`` file, either binary (P4) or ASCII (P1); writing performed per row.
+
+    Source L is used as is, RGB is converted to L first, alpha is skipped.
+    Samples below ``threshold`` become ink on (black), others become ink off (white).
+
+    :param out_filename: name of the PBM file to be written,
+        or writable binary file-like object;
+    :type out_filename: str | PathLike | BinaryIO
+    :param list_3d: image as list (image) of lists (rows) of lists (pixels)
+        of ints (channels), or flat ``PNMImage``;
+    :type list_3d: list[list[list[int]]] | PNMImage
+    :param int maxcolors: number of colors per channel for current image,
+        either 255, or 65535;
+    :param bool bin: whether written file will be binary or ASCII;
+    :param threshold: black/white threshold, default is half of ``maxcolors``;
+    :type threshold: int | None
+    :param bool dither: if set ``True``, distribute thresholding error
+        to neighbouring pixels (Floyd-Steinberg error diffusion).
+    :return: None
+
+    """
+
+    # ↓ Image X, Y, Z sizes
+    if isinstance(list_3d, PNMImage):
+        X, Y, Z = list_3d.X, list_3d.Y, list_3d.Z
+    else:
+        Y, X, Z = (len(list_3d), len(list_3d[0]), len(list_3d[0][0]))
+
+    if threshold is None:
+        threshold = (maxcolors + 1) // 2
+
+    def _row_l(y: int) -> list[int]:
+        """Get row ``y`` as list of L samples."""
+
+        if isinstance(list_3d, PNMImage):
+            row = list_3d.row(y)
+            channels = [row[z::Z].tolist() for z in range(min(Z, 3))]
+        else:
+            channels = [[pixel[z] for pixel in list_3d[y]] for z in range(min(Z, 3))]
+        if Z < 3:  # L or LA image
+            return channels[0]
+        # ↓ RGB to L, ITU-R 601-2 luma
+        return [(299 * r + 587 * g + 114 * b) // 1000 for r, g, b in zip(*channels)]
+
+    # ↓ Thresholding table for 8 bit rows: sample to ASCII bit, '1' being ink on
+    table = bytes(49 if value < threshold else 48 for value in range(256)) if maxcolors < 256 else None
+
+    row_width = (X + 7) // 8  # Rounded up version of width, to get whole bytes including junk at EOLNs
+    errors_next = [0.0] * (X + 2)  # Error diffusion buffer for next row, padded at both ends
+
+    # ↓ Stream given is written to as is, file name is opened
+    with open(out_filename, 'wb') if not hasattr(out_filename, 'write') else nullcontext(out_filename) as file_pbm:
+        file_pbm.write(f'{"P4" if bin else "P1"}\n{X} {Y}\n'.encode('ascii'))  # Writing PBM header to file
+        for y in range(Y):
+            row = _row_l(y)
+
+            # ↓ Thresholding whole row to ASCII bits b'0' or b'1'
+            if dither:
+                errors, errors_next = errors_next, [0.0] * (X + 2)
+                row_bits = bytearray(X)
+                for x in range(X):
+                    value = row[x] + errors[x + 1]
+                    if value < threshold:
+                        row_bits[x] = 49  # Ink on
+                        error = value
+                    else:
+                        row_bits[x] = 48  # Ink off
+                        error = value - maxcolors
+                    errors[x + 2] += error * 0.4375  # 7/16 right
+                    errors_next[x] += error * 0.1875  # 3/16 below left
+                    errors_next[x + 1] += error * 0.3125  # 5/16 below
+                    errors_next[x + 2] += error * 0.0625  # 1/16 below right
+            elif table is not None:
+                row_bits = bytes(row).translate(table)
+            else:
+                row_bits = bytes(49 if value < threshold else 48 for value in row)
+
+            if bin:
+                # ↓ Packing ASCII bits to bytes, padding last byte with junk zeroes
+                file_pbm.write(int(row_bits.ljust(row_width * 8, b'0'), 2).to_bytes(row_width, 'big'))
+            else:
+                # ↓ Whitespace between P1 samples is optional; breaking lines to fulfill specs line <= 70 char
+                file_pbm.write(b'\n'.join(row_bits[i : i + 70] for i in range(0, X, 70)) + b'\n')
+
+    return None
+# ↑ End of 'list2pbm' function writing binary or ASCII PBM file
+
+
+""" ╔══════════════════════════════╗
+    ║  pnm2ndarray, ndarray2pnm    ║
+    ║  for optional NumPy interop  ║
+    ╚══════════════════════════════╝ """
+
+
+def pnm2ndarray(in_filename, memmap: bool = False):
+    """Read PBM, PGM, PPM or PAM file to NumPy ``ndarray``; requires NumPy.
+
+    Binary P5, P6 and P7 raster is taken as is, without decoding:
+    read from file into array at once, mapped to memory if ``memmap`` is ``True``,
+    or viewed in place if PNM data in memory is given.
+    ASCII and 1 bit formats are decoded same way as in ``pnm2list``.
+
+    :param in_filename: input file name,
+        or PNM data in memory as ``bytes``, ``bytearray`` or ``memoryview``,
+        or binary file-like object with ``read()``, like ``sys.stdin.buffer`` pipe;
+    :type in_filename: str | PathLike | bytes | bytearray | memoryview | BinaryIO
+    :param bool memmap: if set ``True``, return read-only ``numpy.memmap``
+        of binary file raster instead of reading it;
+    :return X, Y, Z, maxcolors, ndarray: tuple, consisting of:
+
+    - ``X``, ``Y``, ``Z``: PNM image dimensions (int);
+    - ``maxcolors``: number of colors per channel for current image (int),
+      either 255, or 65535;
+    - ``ndarray``: array of shape (Y, X, Z), dtype ``uint8``,
+      or big-endian ``uint16`` (``'>u2'``) for 16 bit images.
+
+    """
+
+    np = _numpy()
+    if np is None:
+        raise ImportError('pnm2ndarray requires NumPy')
+
+    if isinstance(in_filename, (str, PathLike)):  # Real file, header read from mapping
+        with open(in_filename, 'rb') as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as full_bytes_mmap:
+                magic, X, Y, Z, maxcolors, offset = _pnm_header(full_bytes_mmap)
+                # ↓ Raster stored in ndarray-compatible form, unless it is PAM 1 bit to be promoted
+                raw = magic in ('P5', 'P6', 'P7') and not (magic == 'P7' and maxcolors == 1)
+                if raw:
+                    dtype = np.dtype(np.uint8) if maxcolors < 256 else np.dtype('>u2')
+                    if offset + X * Y * Z * dtype.itemsize > len(full_bytes_mmap):
+                        raise ValueError(f'{magic} image data is truncated')
+                elif memmap:
+                    raise ValueError(f'{magic} can not be memory-mapped, only binary P5, P6 or P7 can')
+                else:  # Decoding in place
+                    maxcolors, array_1d = _decode_raster(full_bytes_mmap, magic, X, Y, Z, maxcolors, offset)
+
+        if raw:
+            if memmap:
+                return (X, Y, Z, maxcolors, np.memmap(in_filename, dtype=dtype, mode='r', offset=offset, shape=(Y, X, Z)))
+            return (X, Y, Z, maxcolors, np.fromfile(in_filename, dtype=dtype, count=X * Y * Z, offset=offset).reshape(Y, X, Z))
+
+    else:
+        if memmap:
+            raise ValueError('Only file given by name can be memory-mapped')
+        if hasattr(in_filename, 'read'):  # File-like object, possibly non-seekable pipe
+            frame = _read_frame(_StreamBuffer(in_filename))
+            if frame is None:
+                raise ValueError('No PNM image in stream')
+            magic, X, Y, Z, maxcolors, offset, buffer = frame
+        else:  # Bytes-like object, viewed in place
+            buffer = in_filename
+            magic, X, Y, Z, maxcolors, offset = _pnm_header(buffer)
+
+        if magic in ('P5', 'P6', 'P7') and not (magic == 'P7' and maxcolors == 1):
+            dtype = np.dtype(np.uint8) if maxcolors < 256 else np.dtype('>u2')
+            if offset + X * Y * Z * dtype.itemsize > len(buffer):
+                raise ValueError(f'{magic} image data is truncated')
+            return (X, Y, Z, maxcolors, np.frombuffer(buffer, dtype=dtype, count=X * Y * Z, offset=offset).reshape(Y, X, Z))
+        maxcolors, array_1d = _decode_raster(buffer, magic, X, Y, Z, maxcolors, offset)
+
+    # ↓ Decoded array wrapped without copying for 8 bit, converted to big-endian for 16 bit
+    ndarray = np.frombuffer(array_1d, dtype=np.uint8 if maxcolors < 256 else np.uint16)
+    if maxcolors > 255:
+        ndarray = ndarray.astype('>u2')
+    return (X, Y, Z, maxcolors, ndarray.reshape(Y, X, Z))
+# ↑ End of 'pnm2ndarray' function
+
+
+def ndarray2pnm(out_filename, ndarray, maxcolors: int | None = None, bin: bool = True, pam: bool = False) -> None:
+    """Write NumPy ``ndarray`` to PNM file; requires NumPy.
+
+    Array data is converted to bytes at once, then written same way as with ``list2pnm``.
+
+    :param out_filename: name of the PNM file to be written,
+        or writable binary file-like object;
+    :type out_filename: str | PathLike | BinaryIO
+    :param ndarray: image array of shape (Y, X, Z), or (Y, X) for L image;
+    :type ndarray: numpy.ndarray
+    :param maxcolors: number of colors per channel, either 255, or 65535;
+        default ``None`` means 255 for 1 byte dtype, 65535 otherwise;
+    :type maxcolors: int | None
+    :param bool bin: whether written file will be binary or ASCII;
+    :param bool pam: whether written file will be PAM, keeping alpha.
+    :return: None
+
+    """
+
+    np = _numpy()
+    if np is None:
+        raise ImportError('ndarray2pnm requires NumPy')
+
+    if ndarray.ndim == 2:
+        ndarray = ndarray[:, :, None]  # L image
+    elif ndarray.ndim != 3:
+        raise ValueError(f'Array of {ndarray.ndim} dimensions is not an image')
+    Y, X, Z = ndarray.shape
+
+    if maxcolors is None:
+        maxcolors = 255 if ndarray.dtype.itemsize == 1 else 65535
+
+    # ↓ One conversion to native order flat data, wrapped as PNMImage
+    datatype = 'B' if maxcolors < 256 else 'H'
+    image = PNMImage(X, Y, Z, maxcolors, array.array(datatype, ndarray.astype(np.uint8 if datatype == 'B' else np.uint16).tobytes()))
+
+    list2pnm(out_filename, image, maxcolors, bin=bin, pam=pam)
+
+    return None
+# ↑ End of 'ndarray2pnm' function
+
+
 """ ╔════════════════════╗
     ║ Create empty image ║
     ╚════════════════════╝ """
 
-def create_image(X: int, Y: int, Z: int) -> list[list[list[int]]]:
-    """Create 3D nested list of X * Y * Z size filled with zeroes."""
+def create_image(X: int, Y: int, Z: int, maxcolors: int = 255, flat: bool = False) -> list[list[list[int]]] | PNMImage:
+    """Create 3D nested list, or flat ``PNMImage`` if ``flat`` is ``True``, of X * Y * Z size filled with zeroes."""
+
+    if flat:
+        return PNMImage(X, Y, Z, maxcolors)
 
     new_image = [[[0 for z in range(Z)] for x in range(X)] for y in range(Y)]
 
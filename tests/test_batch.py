@@ -0,0 +1,38 @@
+"""Tests for PyPNM batch conversion, run with ``python -m pytest`` or ``python -m unittest``."""
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pypnm.batch import collect_sources, convert_batch
+
+SAMPLES = Path(__file__).resolve().parent.parent / 'samples'
+
+
+class TestTargetCollision(unittest.TestCase):
+    """Sources mapping to the same output file are reported, not written over each other."""
+
+    def test_same_name_in_two_directories(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            first, second, output = (Path(temp_dir) / name for name in ('a', 'b', 'out'))
+            first.mkdir()
+            second.mkdir()
+            shutil.copy(SAMPLES / 'P6_3x2x255.ppm', first / 'x.ppm')
+            shutil.copy(SAMPLES / 'P3_3x2x255.ppm', second / 'x.ppm')
+            shutil.copy(SAMPLES / 'P6_3x2x255.ppm', first / 'y.pnm')
+            shutil.copy(SAMPLES / 'P3_3x2x255.ppm', first / 'y.ppm')
+
+            done, errors = convert_batch(collect_sources([str(first), str(second)]), str(output), jobs=1, report=lambda line: None)
+
+            self.assertEqual([result[0] for result in done], [str(first / 'x.ppm'), str(first / 'y.pnm')])
+            self.assertEqual([source for source, _ in errors], [str(first / 'y.ppm'), str(second / 'x.ppm')])
+            self.assertTrue(all(message.startswith('FileExistsError') for _, message in errors))
+            self.assertEqual((output / 'x.ppm').read_bytes(), (SAMPLES / 'P6_3x2x255.ppm').read_bytes())
+
+
+if __name__ == '__main__':
+    unittest.main()
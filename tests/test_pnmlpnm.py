@@ -0,0 +1,80 @@
+"""Tests for PyPNM reading and writing, run with ``python -m pytest`` or ``python -m unittest``."""
+
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pypnm
+
+SAMPLES = Path(__file__).resolve().parent.parent / 'samples'
+
+
+class TestAsciiTrailingData(unittest.TestCase):
+    """First image of ASCII file is read, anything after it ignored."""
+
+    def test_first_frame_of_two(self):
+        for name in ('P1_3x2x1.pbm', 'P2_3x2x255.pgm', 'P3_3x2x255.ppm', 'P3_3x2x65535.ppm'):
+            with self.subTest(name=name), tempfile.TemporaryDirectory() as temp_dir:
+                data = (SAMPLES / name).read_bytes()
+                path = Path(temp_dir) / name
+                path.write_bytes(data + b'\n' + data)
+                self.assertEqual(pypnm.pnm2list(str(path)), pypnm.pnm2list(data))
+                self.assertEqual(pypnm.pnm2list(str(path), workers=2), pypnm.pnm2list(data))
+
+    def test_trailing_text(self):
+        for name in ('P1_3x2x1.pbm', 'P2_3x2x255.pgm', 'P3_3x2x255.ppm'):
+            with self.subTest(name=name):
+                data = (SAMPLES / name).read_bytes()
+                self.assertEqual(pypnm.pnm2list(data + b'\nextra'), pypnm.pnm2list(data))
+
+
+
+class TestBinaryTruncated(unittest.TestCase):
+    """Short binary raster is reported as truncated."""
+
+    def test_truncated(self):
+        for name in ('P4_3x2x1.pbm', 'P5_3x2x255.pgm', 'P5_3x2x65535.pgm', 'P6_3x2x255.ppm', 'P6_3x2x65535.ppm'):
+            with self.subTest(name=name), tempfile.TemporaryDirectory() as temp_dir:
+                path = Path(temp_dir) / name
+                path.write_bytes((SAMPLES / name).read_bytes()[0:-1])
+                with self.assertRaisesRegex(ValueError, 'image data is truncated'):
+                    pypnm.pnm2list(str(path))
+
+class _SlowStream(io.RawIOBase):
+    """Stream returning at most 100 bytes per read, like slow pipe."""
+
+    def __init__(self, data: bytes) -> None:
+        self._data = io.BytesIO(data)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        chunk = self._data.read(min(len(buffer), 100))
+        buffer[0 : len(chunk)] = chunk
+        return len(chunk)
+
+
+class TestHeaderComment(unittest.TestCase):
+    """Numbers in comment cut by the end of partial read are not taken for header values."""
+
+    # ↓ Comment longer than the first read of pnm_info, full of numbers
+    DATA = b'P5\n# scanned ' + b' '.join(b'7 9 1' for _ in range(120)) + b'\n3 2\n255\n' + bytes(range(6))
+
+    def test_pnm_info(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / 'comment.pgm'
+            path.write_bytes(self.DATA)
+            self.assertEqual(pypnm.pnm_info(str(path))[0:5], ('P5', 3, 2, 1, 255))
+
+    def test_stream(self):
+        self.assertEqual(pypnm.pnm2list(_SlowStream(self.DATA)), (3, 2, 1, 255, [[[0], [1], [2]], [[3], [4], [5]]]))
+        self.assertEqual([frame[0:4] for frame in pypnm.pnm_frames(_SlowStream(self.DATA * 2))], [(3, 2, 1, 255)] * 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
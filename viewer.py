@@ -23,13 +23,18 @@ __maintainer__ = 'Ilya Razmanov'
 __email__ = 'ilyarazmanov@gmail.com'
 __status__ = 'Production'
 
+from array import array
+from collections import OrderedDict
+from itertools import islice
 from pathlib import Path
 from platform import python_version, python_version_tuple  # Used for info
+from queue import Empty, Queue
 from sys import argv
-from time import localtime, strftime  # Used to show file info only
-from tkinter import Button, Frame, Label, Menu, PhotoImage, Tk
+from threading import Thread
+from time import localtime, perf_counter, strftime  # Used to show file info and to share time with loader
+from tkinter import Button, Canvas, Frame, Label, Menu, PhotoImage, Scrollbar, Tk
 from tkinter.filedialog import askopenfilename, asksaveasfilename
-from tkinter.messagebox import showinfo
+from tkinter.messagebox import showerror, showinfo
 
 import pypnm  # import whole module to display version info
 
@@ -95,31 +100,41 @@ def ShowInfo(event=None) -> None:
 def GetSource(event=None) -> None:
     """Open source image and redefine other controls state."""
 
-    global zoom_factor, zoom_do, zoom_show, preview, preview_data
+    global zoom_factor, zoom_cache, zoom_show, preview
     global X, Y, Z, maxcolors, image3D, sourcefilename, filename_from_command
+    global loader, loader_messages, loader_fill, tiled
+
+    if loader is not None:  # Previous image is still loading
+        return
     zoom_factor = 0
 
     # ↓ Trying to receive file name from command line, if None, opening GUI
     if filename_from_command is None:
-        sourcefilename = askopenfilename(title='Open PPM/PGM file to view', filetypes=[('Portable any map', '.ppm .pgm .pbm .pnm')])
+        sourcefilename = askopenfilename(title='Open PPM/PGM file to view', filetypes=[('Portable any map', '.ppm .pgm .pbm .pnm .pam')])
         if sourcefilename == '':
             return
     else:
         sourcefilename = filename_from_command
         filename_from_command = None  # Removing file name after first open
 
+    DisableControls()
+    image3D = None  # Cleanup, previous image is not needed anymore
     UIBusy()
 
-    # ↓ Loading file, converting data to list.
-    #   NOTE: maxcolors, image3D are GLOBALS!
-    #   They are used during save!
-    X, Y, Z, maxcolors, image3D = pypnm.pnm2list(sourcefilename)
-    # ↓ Converting list to bytes of PPM-like structure "preview_data" in memory
-    preview_data = pypnm.list2bin(image3D, maxcolors)
-    # ↓ Now showing "preview_data" bytes using Tkinter
-    preview = PhotoImage(data=preview_data)
-    # ↓ Adding filename to window title a-la Photoshop
-    sortir.title(f'PNMViewer: {Path(sourcefilename).name}')
+    # ↓ Reading header only, to calculate zoom to fit before loading image.
+    #   GUI X extra = 16 px, GUI Y extra = 63 px
+    try:
+        info = pypnm.pnm_info(sourcefilename)
+    except (OSError, ValueError) as error:
+        showerror(title='Error', message=f'Can not open {Path(sourcefilename).name}', detail=str(error))
+        UINormal()
+        return
+    screen_width = sortir.winfo_screenwidth()
+    screen_height = sortir.winfo_screenheight()
+    if info.X + 16 > screen_width or info.Y + 64 > screen_height:
+        zoom_factor = max(-4, -(max((info.X + 16) // screen_width, (info.Y + 64) // screen_height)))  # min zoom 1/5
+    step = 1 - zoom_factor if zoom_factor < 0 else 1
+
     # ↓ Dictionary of zoom label texts
     zoom_show = {
         -4: 'Zoom 1:5',
@@ -132,40 +147,166 @@ def GetSource(event=None) -> None:
         3: 'Zoom 4:1',
         4: 'Zoom 5:1',
     }
-    # ↓ Dictionary of zoom functions, corresponding to "zoom_show" above
-    zoom_do = {
-        -4: preview.subsample(5, 5),
-        -3: preview.subsample(4, 4),
-        -2: preview.subsample(3, 3),
-        -1: preview.subsample(2, 2),
-        0: preview,  # 1:1
-        1: preview.zoom(2, 2),
-        2: preview.zoom(3, 3),
-        3: preview.zoom(4, 4),
-        4: preview.zoom(5, 5),
-    }
 
-    # ↓ attempt to calculate zoom to fit
-    #   GUI X extra = 16 px, GUI Y extra = 63 px
-    screen_width = sortir.winfo_screenwidth()
-    screen_height = sortir.winfo_screenheight()
-    if X + 16 > screen_width or Y + 64 > screen_height:
-        zoom_factor = -(max((X + 16) // screen_width, (Y + 64) // screen_height))
-
-    preview = zoom_do[zoom_factor]
+    # ↓ Huge binary image is not loaded at all, only tiles in view are read from file
+    tiled = info.magic in ('P4', 'P5', 'P6', 'P7') and info.X * info.Y > TILED_LIMIT
+    if tiled:
+        X, Y, Z, maxcolors = info.X, info.Y, info.Z, info.maxcolors
+        zoom_cache = OrderedDict()  # Cleanup
+        zanyato.pack_forget()
+        frame_canvas.pack(side='top', padx=0, pady=(0, 2))
+        sortir.title(f'PNMViewer: {Path(sourcefilename).name}')
+        canvas.config(scrollregion=(0, 0, 0, 0))  # Forgetting previous view, new one is centered
+        TiledShow()
+        label_zoom.config(text=zoom_show[zoom_factor])
+        EnableControls()
+        h_spacer = min(sortir.winfo_reqwidth(), 9 * sortir.winfo_screenwidth() // 10)
+        v_spacer = min(sortir.winfo_reqheight(), 9 * sortir.winfo_screenheight() // 10)
+        sortir.minsize(h_spacer, v_spacer)
+        sortir.geometry(f'+{(sortir.winfo_screenwidth() - sortir.winfo_width()) // 2}+{(sortir.winfo_screenheight() - sortir.winfo_height()) // 2 - 32}')
+        return
+    frame_canvas.pack_forget()
+    TiledClear()
+    zanyato.pack(side='top', padx=0, pady=(0, 2))
+
+    # ↓ 1:1 image, empty until filled band by band by "PollLoader"
+    preview = PhotoImage(width=info.X, height=info.Y)
+    # ↓ Cache of zoom levels, corresponding to "zoom_show" below,
+    #   filled by "zoomLevel" on demand. 1:1 is the source of all the rest.
+    zoom_cache = OrderedDict({0: preview})
+    loader_fill = 0
+    if zoom_factor < 0:
+        if info.magic in ('P4', 'P5', 'P6', 'P7'):
+            # ↓ Large binary image is shown first as thumbnail, read decimated right from file,
+            #   exactly as "subsample" would show it
+            _, _, _, thumbnail_maxcolors, thumbnail_image = pypnm.pnm_thumbnail(sourcefilename, step=step, flat=True)
+            zoom_cache[zoom_factor] = PhotoImage(data=pypnm.list2bin(thumbnail_image, thumbnail_maxcolors))
+            del thumbnail_image  # Cleanup
+        else:
+            # ↓ ASCII can not be read decimated, so zoomed out level is filled band by band too
+            zoom_cache[zoom_factor] = PhotoImage(width=-(-info.X // step), height=-(-info.Y // step))
+            loader_fill = step
+
+    preview = zoomLevel(zoom_factor)
+    # ↓ Adding filename to window title a-la Photoshop
+    sortir.title(f'PNMViewer: {Path(sourcefilename).name} (loading...)')
     zanyato.config(image=preview, compound='none', borderwidth=1, background=zanyato.master['background'])
     zanyato.pack_configure(pady=max(0, 16 - (preview.height() // 2)))
-    # ↓ binding on preview click
-    zanyato.bind('<Control-Button-1>', zoomIn)  # Ctrl + left click
-    zanyato.bind('<Double-Control-Button-1>', zoomIn)  # Ctrl + left click too fast
-    zanyato.bind('<Control-+>', zoomIn)
-    zanyato.bind('<Control-=>', zoomIn)
-    zanyato.bind('<Alt-Button-1>', zoomOut)  # Alt + left click
-    zanyato.bind('<Double-Alt-Button-1>', zoomOut)  # Alt + left click too fast
-    zanyato.bind('<Control-minus>', zoomOut)
+    label_zoom.config(text=zoom_show[zoom_factor])
+    # ↓ Image is shown, window must respond while rest of it is loading
+    zanyato.config(state='normal', cursor='watch')
+    sortir.update()
+    h_spacer = min(sortir.winfo_reqwidth(), 9 * sortir.winfo_screenwidth() // 10)
+    v_spacer = min(sortir.winfo_reqheight(), 9 * sortir.winfo_screenheight() // 10)
+    sortir.minsize(h_spacer, v_spacer)
+    sortir.geometry(f'+{(sortir.winfo_screenwidth() - sortir.winfo_width()) // 2}+{(sortir.winfo_screenheight() - sortir.winfo_height()) // 2 - 32}')
+
+    # ↓ Loading file in worker thread, keeping image data flat.
+    #   NOTE: maxcolors, image3D are GLOBALS!
+    #   They are used during save, and set by "PollLoader" once loading is done.
+    loader_messages = Queue()
+    loader = Thread(target=LoadImage, args=(sourcefilename, step, loader_messages), daemon=True)
+    loader.start()
+    sortir.after(LOADER_POLL, PollLoader)
+
+
+def LoadImage(filename: str, step: int, messages: Queue) -> None:
+    """Read image row by row in worker thread, posting bands of preview data to "messages".
+
+    Tkinter is not thread safe, so worker does not touch widgets; messages
+    are picked up by "PollLoader" in main thread. Band height is multiple
+    of "step", so that bands may be subsampled one by one.
+
+    """
+
+    try:
+        rows = pypnm.pnm_iter_rows(filename, flat=True)
+        X, Y, Z, maxcolors = next(rows)
+        band_height = -(-max(1, LOADER_BAND // (X * Z)) // step) * step
+        data = array('B' if maxcolors < 256 else 'H')
+        for y in range(0, Y, band_height):
+            band = array(data.typecode)
+            for row in islice(rows, band_height):
+                band.extend(row)
+            height = len(band) // (X * Z)
+            messages.put(('band', y, height, pypnm.list2bin(pypnm.PNMImage(X, height, Z, maxcolors, band), maxcolors)))
+            data.extend(band)
+        # ↓ Image kept flat, list2pnm and list2bin take it as is
+        messages.put(('done', pypnm.PNMImage(X, Y, Z, maxcolors, data)))
+    except Exception as error:  # Reported by main thread
+        messages.put(('error', f'{type(error).__name__}: {error}'))
+
+
+def PollLoader() -> None:
+    """Pick up messages from loading thread, filling preview in band by band."""
+
+    global X, Y, Z, maxcolors, image3D, loader
+
+    start = perf_counter()
+    while perf_counter() - start < LOADER_POLL / 1000:  # Leaving time for GUI events
+        try:
+            message = loader_messages.get_nowait()
+        except Empty:
+            break
+
+        if message[0] == 'band':
+            _, y, height, band_data = message
+            source = zoom_cache[0]
+            source.put(band_data, to=(0, y))
+            if loader_fill:
+                # ↓ Same pixels as "subsample" takes, band start being multiple of step
+                target = zoom_cache[zoom_factor]
+                target.tk.call(target.name, 'copy', source.name, '-from', 0, y, source.width(), y + height, '-subsample', loader_fill, loader_fill, '-to', 0, y // loader_fill)
+
+        elif message[0] == 'done':
+            image3D = message[1]
+            X, Y, Z, maxcolors = image3D.X, image3D.Y, image3D.Z, image3D.maxcolors
+            loader = None
+            sortir.title(f'PNMViewer: {Path(sourcefilename).name}')
+            EnableControls()
+            return
+
+        else:
+            loader = None
+            sortir.title('PNMViewer')
+            showerror(title='Error', message=f'Can not open {Path(sourcefilename).name}', detail=message[1])
+            UINormal()
+            return
+
+    sortir.after(LOADER_POLL, PollLoader)
+
+
+def DisableControls() -> None:
+    """Disable zoom and save controls while image is loading."""
+
+    for sequence in ('<Control-Button-1>', '<Double-Control-Button-1>', '<Control-+>', '<Control-=>', '<Alt-Button-1>', '<Double-Alt-Button-1>', '<Control-minus>', '<Control-Key-1>', '<Control-Alt-Key-0>'):
+        zanyato.unbind(sequence)
+        canvas.unbind(sequence)
+    sortir.unbind_all('<MouseWheel>')
+    sortir.unbind_all('<Control-i>')
+    butt_plus.config(state='disabled', cursor='arrow')
+    butt_minus.config(state='disabled', cursor='arrow')
+    menu01.entryconfig('Save binary PNM...', state='disabled')
+    menu01.entryconfig('Save ASCII PNM...', state='disabled')
+    menu01.entryconfig('Export via Tkinter...', state='disabled')
+    menu01.entryconfig('Info', state='disabled')
+
+
+def EnableControls() -> None:
+    """Enable zoom and save controls once image is loaded."""
+
+    # ↓ binding on preview click, either label or tiled canvas
+    view = canvas if tiled else zanyato
+    view.bind('<Control-Button-1>', zoomIn)  # Ctrl + left click
+    view.bind('<Double-Control-Button-1>', zoomIn)  # Ctrl + left click too fast
+    view.bind('<Control-+>', zoomIn)
+    view.bind('<Control-=>', zoomIn)
+    view.bind('<Alt-Button-1>', zoomOut)  # Alt + left click
+    view.bind('<Double-Alt-Button-1>', zoomOut)  # Alt + left click too fast
+    view.bind('<Control-minus>', zoomOut)
     sortir.bind_all('<MouseWheel>', zoomWheel)  # Wheel
-    zanyato.bind('<Control-Key-1>', zoomOne)
-    zanyato.bind('<Control-Alt-Key-0>', zoomOne)
+    view.bind('<Control-Key-1>', zoomOne)
+    view.bind('<Control-Alt-Key-0>', zoomOne)
     sortir.bind_all('<Control-i>', ShowInfo)
     # ↓ enabling zoom buttons
     butt_plus.config(state='normal', cursor='hand2')
@@ -175,14 +316,10 @@ def GetSource(event=None) -> None:
     # ↓ enabling "Save as..."
     menu01.entryconfig('Save binary PNM...', state='normal')  # Instead of name numbers from 0 may be used
     menu01.entryconfig('Save ASCII PNM...', state='normal')
-    menu01.entryconfig('Export via Tkinter...', state='normal')
+    menu01.entryconfig('Export via Tkinter...', state='disabled' if tiled else 'normal')  # Whole image is never in Tkinter when tiled
     menu01.entryconfig('Info', state='normal')
     UINormal()
-    h_spacer = min(sortir.winfo_reqwidth(), 9 * sortir.winfo_screenwidth() // 10)
-    v_spacer = min(sortir.winfo_reqheight(), 9 * sortir.winfo_screenheight() // 10)
-    sortir.minsize(h_spacer, v_spacer)
-    sortir.geometry(f'+{(sortir.winfo_screenwidth() - sortir.winfo_width()) // 2}+{(sortir.winfo_screenheight() - sortir.winfo_height()) // 2 - 32}')
-    zanyato.focus_set()  # Required for some binding to work
+    view.focus_set()  # Required for some binding to work
 
 
 def SaveAsPNM(bin: bool) -> None:
@@ -213,10 +350,23 @@ def SaveAsPNM(bin: bool) -> None:
 
     # ↓ Saving "savefilename" in PNM format depending on "bin" value
     UIBusy()
-    pypnm.list2pnm(savefilename, image3D, maxcolors, bin)
-    # ↓ Changing filename to new saved one
-    sourcefilename = savefilename
-    sortir.title(f'PNMViewer: {Path(sourcefilename).name}')
+    if tiled:
+        # ↓ Image is not loaded, so it is copied from source file row by row
+        if Path(savefilename).resolve() == Path(sourcefilename).resolve():
+            showerror(title='Error', message='Can not save image over itself while it is shown tiled')
+            UINormal()
+            return
+        rows = pypnm.pnm_iter_rows(sourcefilename, flat=True)
+        next(rows)
+        with pypnm.PNMWriter(savefilename, X, Y, Z, maxcolors, bin=bin) as writer:
+            for row in rows:
+                writer.write_row(row)
+    else:
+        pypnm.list2pnm(savefilename, image3D, maxcolors, bin)
+        # ↓ Changing filename to new saved one. Tiled image keeps its binary source,
+        #   since tiles are read from it, while copy may be ASCII or have other channel number
+        sourcefilename = savefilename
+        sortir.title(f'PNMViewer: {Path(sourcefilename).name}')
     UINormal()
 
 
@@ -266,15 +416,158 @@ def ExportPhotoImage() -> None:
     UINormal()
 
 
+def zoomLevel(factor: int) -> PhotoImage:
+    """Return PhotoImage for zoom factor, creating it on demand.
+
+    Levels are kept in "zoom_cache" in order of use. Once their total size
+    exceeds ZOOM_CACHE_LIMIT, least recently used ones are dropped,
+    except 1:1 source and level just requested.
+
+    """
+
+    if factor in zoom_cache:
+        zoom_cache.move_to_end(factor)
+        return zoom_cache[factor]
+
+    source = zoom_cache[0]
+    level = source.zoom(factor + 1, factor + 1) if factor > 0 else source.subsample(1 - factor, 1 - factor)
+    zoom_cache[factor] = level
+
+    # ↓ Tk keeps 4 bytes per pixel
+    cache_size = sum(4 * image.width() * image.height() for image in zoom_cache.values())
+    for old_factor in list(zoom_cache):
+        if cache_size <= ZOOM_CACHE_LIMIT:
+            break
+        if old_factor in (0, factor):
+            continue
+        old_level = zoom_cache.pop(old_factor)
+        cache_size -= 4 * old_level.width() * old_level.height()
+
+    return level
+
+
+def TiledSize() -> tuple[int, int]:
+    """Size of tiled image on canvas at current zoom factor."""
+
+    if zoom_factor < 0:
+        return (-(-X // (1 - zoom_factor)), -(-Y // (1 - zoom_factor)))
+    return (X * (zoom_factor + 1), Y * (zoom_factor + 1))
+
+
+def TiledShow() -> None:
+    """Set tiled canvas up for current zoom factor, keeping view center, and show tiles in view."""
+
+    x_first, x_last = canvas.xview()
+    y_first, y_last = canvas.yview()
+    TiledClear()
+    width, height = TiledSize()
+    canvas.config(
+        scrollregion=(0, 0, width, height),
+        width=min(width, 9 * sortir.winfo_screenwidth() // 10 - 48),
+        height=min(height, 9 * sortir.winfo_screenheight() // 10 - 96),
+    )
+    sortir.update_idletasks()
+    # ↓ Moving new view so that its center is where the old one was
+    x_new_first, x_new_last = canvas.xview()
+    y_new_first, y_new_last = canvas.yview()
+    canvas.xview_moveto((x_first + x_last - x_new_last + x_new_first) / 2)
+    canvas.yview_moveto((y_first + y_last - y_new_last + y_new_first) / 2)
+    TiledRender()
+
+
+def TiledClear() -> None:
+    """Remove all tiles."""
+
+    canvas.delete('tile')
+    tiles.clear()
+    tiles_prefetch.clear()
+
+
+def TiledMake(tile_x: int, tile_y: int) -> None:
+    """Read one tile region from file and put it on canvas, zoomed or subsampled."""
+
+    if zoom_factor < 0:
+        step = 1 - zoom_factor
+        box = (tile_x * TILE * step, tile_y * TILE * step, min(X, (tile_x + 1) * TILE * step), min(Y, (tile_y + 1) * TILE * step))
+    else:
+        scale = zoom_factor + 1
+        box = (tile_x * TILE // scale, tile_y * TILE // scale, min(X, (tile_x + 1) * TILE // scale), min(Y, (tile_y + 1) * TILE // scale))
+    _, _, _, tile_maxcolors, region = pypnm.pnm_read_region(sourcefilename, box, flat=True)
+    tile = PhotoImage(data=pypnm.list2bin(region, tile_maxcolors))
+    # ↓ Tile region starts at multiple of step, so subsample takes the same pixels as for whole image
+    if zoom_factor < 0:
+        tile = tile.subsample(step, step)
+    elif zoom_factor > 0:
+        tile = tile.zoom(scale, scale)
+    item = canvas.create_image(tile_x * TILE, tile_y * TILE, image=tile, anchor='nw', tags='tile')
+    tiles[(tile_x, tile_y)] = (item, tile)
+
+
+def TiledRender() -> None:
+    """Show tiles in view, drop tiles far from it, and queue tiles around it for prefetch."""
+
+    global render_pending
+
+    render_pending = False
+    if not tiled:
+        return
+    width, height = TiledSize()
+    x_left = int(canvas.canvasx(0))
+    y_top = int(canvas.canvasy(0))
+    columns = range(max(0, x_left // TILE), min(-(-width // TILE), (x_left + canvas.winfo_width()) // TILE + 1))
+    rows = range(max(0, y_top // TILE), min(-(-height // TILE), (y_top + canvas.winfo_height()) // TILE + 1))
+
+    # ↓ Tiles in view plus TILE_PREFETCH more tiles on every side
+    around_columns = range(max(0, columns.start - TILE_PREFETCH), min(-(-width // TILE), columns.stop + TILE_PREFETCH))
+    around_rows = range(max(0, rows.start - TILE_PREFETCH), min(-(-height // TILE), rows.stop + TILE_PREFETCH))
+    around = {(tile_x, tile_y) for tile_y in around_rows for tile_x in around_columns}
+
+    for key in [key for key in tiles if key not in around]:
+        canvas.delete(tiles.pop(key)[0])
+    for tile_y in rows:
+        for tile_x in columns:
+            if (tile_x, tile_y) not in tiles:
+                TiledMake(tile_x, tile_y)
+
+    was_prefetching = bool(tiles_prefetch)
+    tiles_prefetch[:] = [key for key in sorted(around) if key not in tiles]
+    if tiles_prefetch and not was_prefetching:
+        sortir.after(1, TiledPrefetch)
+
+
+def TiledPrefetch() -> None:
+    """Make one of queued tiles around view, leaving time for GUI events in between."""
+
+    if tiles_prefetch:
+        key = tiles_prefetch.pop()
+        if key not in tiles:
+            TiledMake(*key)
+    if tiles_prefetch:
+        sortir.after(1, TiledPrefetch)
+
+
+def TiledScrolled(scrollbar: Scrollbar, first: str, last: str) -> None:
+    """Update scrollbar once canvas view changed, and render tiles when idle."""
+
+    global render_pending
+
+    scrollbar.set(first, last)
+    if not render_pending:
+        render_pending = True
+        sortir.after_idle(TiledRender)
+
+
 def zoomIn(event=None) -> None:
     """Zoom preview in."""
 
     global zoom_factor, preview
     zoom_factor = min(zoom_factor + 1, 4)  # max zoom 5
-    preview = PhotoImage(data=preview_data)
-    preview = zoom_do[zoom_factor]
-    zanyato.config(image=preview, compound='none')
-    zanyato.pack_configure(pady=max(0, 16 - (preview.height() // 2)))
+    if tiled:
+        TiledShow()
+    else:
+        preview = zoomLevel(zoom_factor)
+        zanyato.config(image=preview, compound='none')
+        zanyato.pack_configure(pady=max(0, 16 - (preview.height() // 2)))
     # ↓ updating zoom factor display
     label_zoom.config(text=zoom_show[zoom_factor])
     # ↓ reenabling +/- buttons
@@ -290,10 +583,12 @@ def zoomOut(event=None) -> None:
 
     global zoom_factor, preview
     zoom_factor = max(zoom_factor - 1, -4)  # min zoom 1/5
-    preview = PhotoImage(data=preview_data)
-    preview = zoom_do[zoom_factor]
-    zanyato.config(image=preview, compound='none')
-    zanyato.pack_configure(pady=max(0, 16 - (preview.height() // 2)))
+    if tiled:
+        TiledShow()
+    else:
+        preview = zoomLevel(zoom_factor)
+        zanyato.config(image=preview, compound='none')
+        zanyato.pack_configure(pady=max(0, 16 - (preview.height() // 2)))
     # ↓ updating zoom factor display
     label_zoom.config(text=zoom_show[zoom_factor])
     # ↓ reenabling +/- buttons
@@ -318,9 +613,12 @@ def zoomOne(event=None) -> None:
 
     global zoom_factor, preview
     zoom_factor = 0
-    preview = zoom_do[zoom_factor]
-    zanyato.config(image=preview, compound='none')
-    zanyato.pack_configure(pady=max(0, 16 - (preview.height() // 2)))
+    if tiled:
+        TiledShow()
+    else:
+        preview = zoomLevel(zoom_factor)
+        zanyato.config(image=preview, compound='none')
+        zanyato.pack_configure(pady=max(0, 16 - (preview.height() // 2)))
     # ↓ updating zoom factor display
     label_zoom.config(text=zoom_show[zoom_factor])
 
@@ -335,6 +633,23 @@ def zoomOne(event=None) -> None:
 
 zoom_factor = 0
 sourcefilename = X = Y = Z = maxcolors = None
+zoom_cache = OrderedDict()
+loader = loader_messages = None
+loader_fill = 0
+tiled = render_pending = False
+tiles = {}  # (tile_x, tile_y): (canvas item, PhotoImage)
+tiles_prefetch = []
+
+# ↓ Memory budget for cached zoom levels, bytes
+ZOOM_CACHE_LIMIT = 256 * 1048576
+# ↓ Loader band size, samples, and time between checks for loaded bands, ms
+LOADER_BAND = 1048576
+LOADER_POLL = 50
+# ↓ Images bigger than that, pixels, are shown tiled, reading only tiles in view.
+#   Tile size, px, divisible by all zoom factors, and tiles prefetched around view
+TILED_LIMIT = 4096 * 4096
+TILE = 240
+TILE_PREFETCH = 1
 
 sortir = Tk()
 sortir.title('PNMViewer')
@@ -372,6 +687,19 @@ zanyato.bind('<Double-Button-1>', GetSource)
 frame_img.bind('<Double-Button-1>', GetSource)
 zanyato.pack(side='top', padx=0, pady=(0, 2))
 
+# ↓ Scrollable canvas for tiled images, packed instead of "zanyato" when needed
+frame_canvas = Frame(frame_img)
+canvas = Canvas(frame_canvas, borderwidth=0, highlightthickness=0, cursor='fleur')
+scroll_x = Scrollbar(frame_canvas, orient='horizontal', command=canvas.xview)
+scroll_y = Scrollbar(frame_canvas, orient='vertical', command=canvas.yview)
+canvas.config(xscrollcommand=lambda first, last: TiledScrolled(scroll_x, first, last), yscrollcommand=lambda first, last: TiledScrolled(scroll_y, first, last))
+canvas.grid(row=0, column=0, sticky='nsew')
+scroll_x.grid(row=1, column=0, sticky='ew')
+scroll_y.grid(row=0, column=1, sticky='ns')
+# ↓ Dragging image with mouse
+canvas.bind('<ButtonPress-1>', lambda event: canvas.scan_mark(event.x, event.y))
+canvas.bind('<B1-Motion>', lambda event: canvas.scan_dragto(event.x, event.y, gain=1))
+
 frame_zoom = Frame(frame_img, width=300, borderwidth=2, relief='groove')
 frame_zoom.pack(side='bottom')
 
@@ -398,7 +726,7 @@ sortir.geometry(f'+{(sortir.winfo_screenwidth() - sortir.winfo_width()) // 2}+{(
 if len(argv) == 2:
     sortir.focus_force()  # Otherwise loses focus when run from command line
     try_to_open = argv[1]
-    if Path(try_to_open).exists() and Path(try_to_open).is_file() and (Path(try_to_open).suffix.lower() in ('.ppm', '.pgm', '.pbm', '.pnm')):
+    if Path(try_to_open).exists() and Path(try_to_open).is_file() and (Path(try_to_open).suffix.lower() in ('.ppm', '.pgm', '.pbm', '.pnm', '.pam')):
         filename_from_command = str(Path(try_to_open).resolve())
         GetSource()
     else: